@@ -0,0 +1,33 @@
+"""Match check/score index
+
+Revision ID: 5b1e8f3a2c7d
+Revises: c4c0db214aae
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e8f3a2c7d'
+down_revision = 'c4c0db214aae'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches for a report are read ordered by score; the composite index
+    # returns them pre-sorted and makes the check_id-only index redundant
+    op.create_index(
+        'idx_match_check_score',
+        'matches',
+        ['check_id', sa.text('similarity_score DESC')],
+        unique=False
+    )
+    op.drop_index('ix_matches_check_id', table_name='matches')
+
+
+def downgrade() -> None:
+    op.create_index('ix_matches_check_id', 'matches', ['check_id'], unique=False)
+    op.drop_index('idx_match_check_score', table_name='matches')
@@ -0,0 +1,44 @@
+"""Organization lifetime usage columns
+
+Revision ID: 8d2a6c4e9f10
+Revises: 5b1e8f3a2c7d
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2a6c4e9f10'
+down_revision = '5b1e8f3a2c7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('organizations', sa.Column('lifetime_checks', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('organizations', sa.Column('lifetime_cost_usd', sa.Float(), server_default='0', nullable=False))
+
+    # Backfill from existing completed checks
+    op.execute(
+        """
+        UPDATE organizations
+        SET lifetime_checks = usage_totals.checks,
+            lifetime_cost_usd = usage_totals.cost
+        FROM (
+            SELECT organization_id,
+                   count(id) AS checks,
+                   coalesce(sum(estimated_cost_usd), 0) AS cost
+            FROM checks
+            WHERE status = 'completed'
+            GROUP BY organization_id
+        ) AS usage_totals
+        WHERE organizations.id = usage_totals.organization_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('organizations', 'lifetime_cost_usd')
+    op.drop_column('organizations', 'lifetime_checks')
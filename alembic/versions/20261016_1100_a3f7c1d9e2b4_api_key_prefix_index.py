@@ -0,0 +1,24 @@
+"""API key prefix index
+
+Revision ID: a3f7c1d9e2b4
+Revises: 8d2a6c4e9f10
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f7c1d9e2b4'
+down_revision = '8d2a6c4e9f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Authentication looks keys up by prefix before comparing hashes
+    op.create_index(op.f('ix_api_keys_key_prefix'), 'api_keys', ['key_prefix'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_api_keys_key_prefix'), table_name='api_keys')
@@ -0,0 +1,25 @@
+"""Check cleaned text column
+
+Revision ID: b6e2d4f8a1c3
+Revises: a3f7c1d9e2b4
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2d4f8a1c3'
+down_revision = 'a3f7c1d9e2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Article text for the worker, so the broker message carries only the ID
+    op.add_column('checks', sa.Column('cleaned_text', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('checks', 'cleaned_text')
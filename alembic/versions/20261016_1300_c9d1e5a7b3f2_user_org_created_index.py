@@ -0,0 +1,34 @@
+"""User organization/created_at index
+
+Revision ID: c9d1e5a7b3f2
+Revises: b6e2d4f8a1c3
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d1e5a7b3f2'
+down_revision = 'b6e2d4f8a1c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Users are listed per organization newest first; the composite index
+    # returns a page pre-sorted, covers the windowed count, and makes the
+    # organization_id-only index redundant
+    op.create_index(
+        'idx_user_org_created',
+        'users',
+        ['organization_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    op.drop_index('ix_users_organization_id', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_organization_id', 'users', ['organization_id'], unique=False)
+    op.drop_index('idx_user_org_created', table_name='users')
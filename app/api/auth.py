@@ -1,12 +1,15 @@
 """Authentication endpoints."""
 from datetime import datetime, timedelta
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, literal, union_all, bindparam
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.models.user import User
 from app.models.organization import Organization
 from app.schemas.auth import (
@@ -17,12 +20,15 @@ from app.schemas.auth import (
     PasswordChangeRequest
 )
 from app.auth.jwt import (
-    verify_password,
-    get_password_hash,
-    create_access_token
+    verify_password_async,
+    hash_password_async,
+    create_access_token,
+    create_access_token_cached,
+    user_token_claims
 )
 from app.auth.dependencies import get_current_user
 from app.config import settings
+from app.core.user_cache import invalidate_user
 from app.utils.sanitization import sanitize_text
 from app.utils.error_handling import (
     ValidationError,
@@ -35,6 +41,64 @@ from app.utils.error_handling import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Access token lifetime
+_TOKEN_TTL = timedelta(minutes=settings.jwt_access_token_expire_minutes)
+_TOKEN_TTL_SECONDS = settings.jwt_access_token_expire_minutes * 60
+
+# Reports which of email/username/organization email are already taken,
+# in one query
+_REGISTER_CONFLICTS_STMT = union_all(
+    select(literal("email")).where(User.email == bindparam("email")),
+    select(literal("username")).where(User.username == bindparam("username")),
+    select(literal("organization_email")).where(Organization.email == bindparam("email")),
+)
+# Login only needs the credential columns plus what UserResponse returns
+_USER_BY_EMAIL_STMT = (
+    select(User)
+    .options(load_only(
+        User.id,
+        User.email,
+        User.username,
+        User.full_name,
+        User.role,
+        User.organization_id,
+        User.is_active,
+        User.is_superuser,
+        User.hashed_password,
+        User.created_at,
+        User.last_login_at
+    ))
+    .where(User.email == bindparam("email"))
+)
+
+
+async def _record_last_login(user_id, logged_in_at: datetime) -> None:
+    """
+    Persist a user's last login time outside the login request.
+
+    Runs as a background task with its own session so the login response
+    does not wait on the write.
+
+    Args:
+        user_id: User ID
+        logged_in_at: Login timestamp
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(last_login_at=logged_in_at)
+            )
+            await db.commit()
+        await invalidate_user(user_id)
+    except SQLAlchemyError as e:
+        log_error(
+            e,
+            context="record_last_login",
+            extra={"user_id": str(user_id), "error_type": "database"}
+        )
+
 
 @router.post("/register", response_model=LoginResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -49,7 +113,7 @@ async def register(
     **Note**: The first user created for an organization automatically becomes an admin.
     """
     log_info(
-        f"Registration attempt for email: {request.email}",
+        "Registration attempt for email: %s", request.email,
         context="register",
         extra={"email": request.email, "username": request.username}
     )
@@ -73,13 +137,16 @@ async def register(
         if not organization_name:
             raise ValidationError("Organization name cannot be empty", field="organization_name")
 
-        # Check if user exists
+        # Check email/username/organization email conflicts in one round trip
         result = await db.execute(
-            select(User).where(User.email == email)
+            _REGISTER_CONFLICTS_STMT,
+            {"email": email, "username": username}
         )
-        if result.scalar_one_or_none():
+        conflicts = set(result.scalars().all())
+
+        if "email" in conflicts:
             log_warning(
-                f"Registration failed: Email already exists - {email}",
+                "Registration failed: Email already exists - %s", email,
                 context="register"
             )
             raise HTTPException(
@@ -87,12 +154,9 @@ async def register(
                 detail="Email already registered"
             )
 
-        result = await db.execute(
-            select(User).where(User.username == username)
-        )
-        if result.scalar_one_or_none():
+        if "username" in conflicts:
             log_warning(
-                f"Registration failed: Username already taken - {username}",
+                "Registration failed: Username already taken - %s", username,
                 context="register"
             )
             raise HTTPException(
@@ -100,69 +164,73 @@ async def register(
                 detail="Username already taken"
             )
 
-        # Check if organization email exists
-        result = await db.execute(
-            select(Organization).where(Organization.email == email)
-        )
-        if result.scalar_one_or_none():
+        if "organization_email" in conflicts:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Organization email already registered"
             )
 
-        # Create organization
-        organization = Organization(
-            name=organization_name,
-            email=email,
-            tier="free",
-            monthly_check_limit=100
+        # Create the organization and its first user (admin) in a single
+        # statement: the organization INSERT runs as a CTE whose id feeds
+        # the user INSERT, and RETURNING hands back the new user row
+        hashed_password = await hash_password_async(request.password)
+        now = datetime.utcnow()
+        # Columns shared with users get distinct bind names so the two
+        # INSERTs' parameters don't collide in the combined statement
+        new_organization = (
+            insert(Organization)
+            .values(
+                id=bindparam("organization_id", uuid.uuid4()),
+                email=bindparam("organization_email", email),
+                is_active=bindparam("organization_is_active", True),
+                created_at=bindparam("organization_created_at", now),
+                updated_at=bindparam("organization_updated_at", now),
+                name=organization_name,
+                tier="free",
+                monthly_check_limit=100
+            )
+            .returning(Organization.id)
+            .cte("new_organization")
         )
-        db.add(organization)
-        await db.flush()
-
-        # Create user (first user is admin)
-        hashed_password = get_password_hash(request.password)
-        user = User(
-            organization_id=organization.id,
-            email=email,
-            username=username,
-            hashed_password=hashed_password,
-            full_name=full_name,
-            role="admin",  # First user is admin
-            is_active=True,
-            email_verified=False,
-            last_login_at=datetime.utcnow()
+        result = await db.execute(
+            insert(User)
+            .values(
+                id=uuid.uuid4(),
+                organization_id=select(new_organization.c.id).scalar_subquery(),
+                email=email,
+                username=username,
+                hashed_password=hashed_password,
+                full_name=full_name,
+                role="admin",  # First user is admin
+                is_active=True,
+                email_verified=False,
+                last_login_at=now
+            )
+            .returning(User)
         )
-        db.add(user)
-
+        user = result.scalar_one()
         await db.commit()
-        await db.refresh(user)
 
         log_info(
-            f"User registered successfully: {user.id}",
+            "User registered successfully: %s", user.id,
             context="register",
             extra={
                 "user_id": str(user.id),
-                "organization_id": str(organization.id),
+                "organization_id": str(user.organization_id),
                 "email": email
             }
         )
 
         # Create access token
         access_token = create_access_token(
-            data={
-                "user_id": user.id,
-                "email": user.email,
-                "organization_id": user.organization_id,
-                "role": user.role
-            },
-            expires_delta=timedelta(minutes=settings.jwt_access_token_expire_minutes)
+            data=user_token_claims(user),
+            expires_delta=_TOKEN_TTL
         )
 
         return LoginResponse(
             access_token=access_token,
             token_type="bearer",
-            expires_in=settings.jwt_access_token_expire_minutes * 60,
+            expires_in=_TOKEN_TTL_SECONDS,
             user=UserResponse.model_validate(user)
         )
 
@@ -195,6 +263,7 @@ async def register(
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: LoginRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -205,7 +274,7 @@ async def login(
     **Token Usage**: Include the token in the Authorization header as `Bearer <token>`
     """
     log_info(
-        f"Login attempt for email: {request.email}",
+        "Login attempt for email: %s", request.email,
         context="login",
         extra={"email": request.email}
     )
@@ -215,14 +284,12 @@ async def login(
         email = sanitize_text(request.email, max_length=255).strip().lower()
 
         # Get user by email
-        result = await db.execute(
-            select(User).where(User.email == email)
-        )
+        result = await db.execute(_USER_BY_EMAIL_STMT, {"email": email})
         user = result.scalar_one_or_none()
 
-        if not user or not verify_password(request.password, user.hashed_password):
+        if not user or not await verify_password_async(request.password, user.hashed_password):
             log_warning(
-                f"Login failed: Invalid credentials for {email}",
+                "Login failed: Invalid credentials for %s", email,
                 context="login",
                 extra={"email": email}
             )
@@ -234,7 +301,7 @@ async def login(
 
         if not user.is_active:
             log_warning(
-                f"Login failed: Inactive user {email}",
+                "Login failed: Inactive user %s", email,
                 context="login",
                 extra={"email": email, "user_id": str(user.id)}
             )
@@ -243,13 +310,14 @@ async def login(
                 detail="User account is inactive"
             )
 
-        # Update last login
-        user.last_login_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(user)
+        # Record last login after the response is sent; the in-memory value
+        # is set without marking the user dirty so no UPDATE is flushed here
+        logged_in_at = datetime.utcnow()
+        set_committed_value(user, "last_login_at", logged_in_at)
+        background_tasks.add_task(_record_last_login, user.id, logged_in_at)
 
         log_info(
-            f"User logged in successfully: {user.id}",
+            "User logged in successfully: %s", user.id,
             context="login",
             extra={
                 "user_id": str(user.id),
@@ -258,21 +326,16 @@ async def login(
             }
         )
 
-        # Create access token
-        access_token = create_access_token(
-            data={
-                "user_id": user.id,
-                "email": user.email,
-                "organization_id": user.organization_id,
-                "role": user.role
-            },
-            expires_delta=timedelta(minutes=settings.jwt_access_token_expire_minutes)
+        # Create access token (a recent one for the same claims is reused)
+        access_token, expires_in = create_access_token_cached(
+            data=user_token_claims(user),
+            expires_delta=_TOKEN_TTL
         )
 
         return LoginResponse(
             access_token=access_token,
             token_type="bearer",
-            expires_in=settings.jwt_access_token_expire_minutes * 60,
+            expires_in=expires_in,
             user=UserResponse.model_validate(user)
         )
 
@@ -311,7 +374,7 @@ async def get_current_user_info(
 
     Requires authentication token.
     """
-    return UserResponse.model_validate(current_user)
+    return current_user
 
 
 @router.post("/change-password")
@@ -325,18 +388,21 @@ async def change_password(
 
     Requires authentication and current password verification.
     """
+    # The password hash is not cached with the user, so load it explicitly
+    await db.refresh(current_user, ["hashed_password"])
+
     # Verify old password
-    if not verify_password(request.old_password, current_user.hashed_password):
+    if not await verify_password_async(request.old_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
 
     # Update password
-    current_user.hashed_password = get_password_hash(request.new_password)
-    current_user.updated_at = datetime.utcnow()
+    current_user.hashed_password = await hash_password_async(request.new_password)
 
     await db.commit()
+    await invalidate_user(current_user.id)
 
     return {"message": "Password changed successfully"}
 
@@ -1,16 +1,20 @@
 """Similarity check endpoints."""
+import asyncio
+import hashlib
+from typing import Optional, Tuple
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, bindparam
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.models.organization import Organization
 from app.models.check import Check
-from app.models.match import Match
 from app.schemas.check import (
     CheckCreate,
     CheckResponse,
@@ -19,7 +23,8 @@ from app.schemas.check import (
     MatchedChunk
 )
 from app.api.dependencies import get_current_organization
-from app.utils.helpers import calculate_ttl_expiry
+from app.tasks.celery_app import celery_app
+from app.core.quota import try_reserve, release_reservation, current_period
 from app.utils.sanitization import clean_article_text, validate_metadata
 from app.utils.error_handling import (
     ValidationError,
@@ -34,10 +39,175 @@ from app.utils.error_handling import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/check", tags=["Similarity Checks"])
 
+# How long check records are kept before auto-deletion
+_CHECK_TTL = timedelta(days=7)
+
+# Unstarted similarity tasks are discarded after this many seconds
+_CHECK_TASK_EXPIRES = 3600
+
+# Client caching for check polling: in-flight checks change within seconds,
+# finished ones never change again
+_POLLING_CACHE_CONTROL = "private, max-age=2"
+_FINISHED_CACHE_CONTROL = "private, max-age=86400, immutable"
+
+# Report summaries by risk level
+_SUMMARY_TEMPLATES = {
+    "low": (
+        "Analysis complete. Your content shows low similarity to existing sources. "
+        "Found {count} minor matches across {sources} sources checked."
+    ),
+    "medium": (
+        "Analysis complete. Your content shows moderate similarity to existing sources. "
+        "Found {count} matches across {sources} sources. "
+        "Review the highlighted sections for editorial considerations."
+    ),
+    "high": (
+        "Analysis complete. Your content shows high similarity to existing sources. "
+        "Found {count} significant matches across {sources} sources. "
+        "We recommend reviewing these matches carefully before publication."
+    ),
+}
+
+# Matches are joined in (ordered by score via the relationship) so a
+# report is read in a single round trip
+_CHECK_WITH_MATCHES_STMT = (
+    select(Check)
+    .options(joinedload(Check.matches))
+    .where(Check.id == bindparam("check_id"))
+    .where(Check.organization_id == bindparam("organization_id"))
+)
+
+
+def _clean_and_count_words(article_text: str) -> Tuple[str, int]:
+    """
+    Sanitize article text and count its words.
+
+    Args:
+        article_text: Raw article text from the request
+
+    Returns:
+        Tuple of (cleaned text, word count)
+    """
+    cleaned_text = clean_article_text(
+        article_text,
+        max_length=50000  # ~5000 words * 10 chars per word average
+    )
+    # str.split is the fastest counter CPython offers; this is the only
+    # full split on the request path
+    return cleaned_text, len(cleaned_text.split())
+
+
+async def _reserve_check(db: AsyncSession, organization: Organization) -> Tuple[bool, Optional[str]]:
+    """
+    Reserve one check from an organization's monthly quota.
+
+    The Redis counter is the hot path (folded back into the organization
+    row by a periodic task); if Redis is unavailable, the check is reserved
+    with an atomic conditional UPDATE instead. Either way concurrent
+    requests cannot push the organization over its limit.
+
+    Args:
+        db: Database session
+        organization: Organization submitting the check
+
+    Returns:
+        Tuple of (reserved, quota period of the Redis counter used, or None
+        if the check was reserved in the database)
+    """
+    now = datetime.utcnow()
+    reserved = await try_reserve(
+        organization.id,
+        organization.monthly_check_limit,
+        organization.current_month_checks,
+        now=now
+    )
+    if reserved is not None:
+        return reserved, current_period(now)
+
+    result = await db.execute(
+        update(Organization)
+        .where(Organization.id == organization.id)
+        .where(Organization.current_month_checks < Organization.monthly_check_limit)
+        .values(current_month_checks=Organization.current_month_checks + 1)
+        .returning(Organization.current_month_checks)
+    )
+    return result.scalar_one_or_none() is not None, None
+
+
+async def _enqueue_check(
+    check_id: UUID,
+    organization_id: UUID,
+    reserved_period: Optional[str]
+) -> None:
+    """
+    Queue a committed check for processing.
+
+    Runs as a background task after the response is sent. The task is sent
+    by name so the API never imports the task module (and its embedding
+    model), and the broker publish runs in a thread to keep it off the
+    event loop. Only the check ID is sent; the worker reads the article
+    from the check row. Results are stored on the check row too, so the
+    task result is not kept. If the broker is unreachable the check is
+    marked failed and its quota reservation is returned.
+
+    Args:
+        check_id: Check ID
+        organization_id: Organization that submitted the check
+        reserved_period: Quota period of the Redis reservation, or None if
+            the quota was reserved in the database
+    """
+    try:
+        await asyncio.to_thread(
+            celery_app.send_task,
+            "process_similarity_check",
+            args=(str(check_id),),
+            ignore_result=True,
+            expires=_CHECK_TASK_EXPIRES
+        )
+        return
+    except Exception as e:
+        log_error(
+            e,
+            context="enqueue_similarity_check",
+            user_id=str(organization_id),
+            extra={"check_id": str(check_id), "error_type": "broker"}
+        )
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Check)
+                .where(Check.id == check_id)
+                .values(
+                    status="failed",
+                    error_message="Failed to queue check for processing",
+                    cleaned_text=None,
+                    completed_at=datetime.utcnow()
+                )
+            )
+            if reserved_period is None:
+                await db.execute(
+                    update(Organization)
+                    .where(Organization.id == organization_id)
+                    .values(current_month_checks=Organization.current_month_checks - 1)
+                )
+            await db.commit()
+    except SQLAlchemyError as e:
+        log_error(
+            e,
+            context="enqueue_similarity_check",
+            user_id=str(organization_id),
+            extra={"check_id": str(check_id), "error_type": "database"}
+        )
+
+    if reserved_period is not None:
+        await release_reservation(organization_id, reserved_period)
+
 
 @router.post("", response_model=CheckResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_similarity_check(
     request: CheckCreate,
+    background_tasks: BackgroundTasks,
     organization: Organization = Depends(get_current_organization),
     db: AsyncSession = Depends(get_db)
 ):
@@ -52,25 +222,49 @@ async def create_similarity_check(
     **Processing time**: 15-30 seconds average
     """
     log_info(
-        f"Similarity check requested by organization {organization.id}",
+        "Similarity check requested by organization %s", organization.id,
         context="create_similarity_check",
         extra={"organization_id": str(organization.id), "sources": request.sources}
     )
 
     try:
-        # Sanitize article text to handle special characters
-        cleaned_text = clean_article_text(
-            request.article_text,
-            max_length=50000  # ~5000 words * 10 chars per word average
+        # Sanitize the article in a worker thread (milliseconds of CPU for
+        # long articles, kept off the event loop) while the quota
+        # reservation is in flight
+        sanitized, reservation = await asyncio.gather(
+            asyncio.to_thread(_clean_and_count_words, request.article_text),
+            _reserve_check(db, organization),
+            return_exceptions=True
         )
-
-        # Sanitize metadata
-        cleaned_metadata = validate_metadata(request.metadata or {})
-
-        # Check monthly quota
-        if organization.current_month_checks >= organization.monthly_check_limit:
+        if isinstance(reservation, BaseException):
+            raise reservation
+        reserved, reserved_period = reservation
+
+        try:
+            if isinstance(sanitized, BaseException):
+                raise sanitized
+            cleaned_text, word_count = sanitized
+
+            # Sanitize metadata (a handful of short fields, cheap inline)
+            cleaned_metadata = validate_metadata(request.metadata or {})
+
+            # Validate minimum word count
+            if word_count < 10:
+                raise ValidationError(
+                    "Article must contain at least 10 words",
+                    field="article_text",
+                    details={"word_count": word_count}
+                )
+        except Exception:
+            # A database reservation rolls back with the request; a Redis
+            # one has to be handed back explicitly
+            if reserved and reserved_period is not None:
+                await release_reservation(organization.id, reserved_period)
+            raise
+
+        if not reserved:
             log_warning(
-                f"Quota exceeded for organization {organization.id}",
+                "Quota exceeded for organization %s", organization.id,
                 context="create_similarity_check",
                 extra={
                     "organization_id": str(organization.id),
@@ -83,17 +277,6 @@ async def create_similarity_check(
                 limit=organization.monthly_check_limit
             )
 
-        # Count words from cleaned text
-        word_count = len(cleaned_text.split())
-
-        # Validate minimum word count
-        if word_count < 10:
-            raise ValidationError(
-                "Article must contain at least 10 words",
-                field="article_text",
-                details={"word_count": word_count}
-            )
-
         # Create check record
         check = Check(
             organization_id=organization.id,
@@ -105,19 +288,21 @@ async def create_similarity_check(
             sensitivity=request.sensitivity,
             store_embeddings=request.store_embeddings and organization.allow_corpus_inclusion,
             check_metadata=cleaned_metadata,
-            expires_at=calculate_ttl_expiry(days=7)
+            cleaned_text=cleaned_text,
+            expires_at=datetime.utcnow() + _CHECK_TTL
         )
 
         db.add(check)
 
-        # Increment usage counter
-        organization.current_month_checks += 1
-
-        await db.commit()
-        await db.refresh(check)
+        try:
+            await db.commit()
+        except SQLAlchemyError:
+            if reserved_period is not None:
+                await release_reservation(organization.id, reserved_period)
+            raise
 
         log_info(
-            f"Check created successfully: {check.id}",
+            "Check created successfully: %s", check.id,
             context="create_similarity_check",
             extra={
                 "check_id": str(check.id),
@@ -126,9 +311,12 @@ async def create_similarity_check(
             }
         )
 
-        # Queue Celery task with cleaned text
-        from app.tasks.similarity_check import process_similarity_check
-        process_similarity_check.delay(str(check.id), cleaned_text)
+        # Queue the Celery task only now that the check row is committed,
+        # and after the response is sent so the client doesn't wait on the
+        # broker
+        background_tasks.add_task(
+            _enqueue_check, check.id, organization.id, reserved_period
+        )
 
         # Return response
         return CheckResponse(
@@ -173,32 +361,34 @@ async def create_similarity_check(
 @router.get("/{check_id}", response_model=CheckResponse)
 async def get_similarity_check(
     check_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     organization: Organization = Depends(get_current_organization),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve results for a similarity check.
 
-    Returns the current status and results (if completed).
+    Returns the current status and results (if completed). Responses carry
+    an ETag; polling with `If-None-Match` returns 304 until the check changes.
     """
     log_info(
-        f"Retrieving check {check_id} for organization {organization.id}",
+        "Retrieving check %s for organization %s", check_id, organization.id,
         context="get_similarity_check",
         extra={"check_id": str(check_id), "organization_id": str(organization.id)}
     )
 
     try:
-        # Get check
+        # Get check along with its matches
         result = await db.execute(
-            select(Check)
-            .where(Check.id == check_id)
-            .where(Check.organization_id == organization.id)
+            _CHECK_WITH_MATCHES_STMT,
+            {"check_id": check_id, "organization_id": organization.id}
         )
-        check = result.scalar_one_or_none()
+        check = result.unique().scalar_one_or_none()
 
         if not check:
             log_warning(
-                f"Check {check_id} not found for organization {organization.id}",
+                "Check %s not found for organization %s", check_id, organization.id,
                 context="get_similarity_check",
                 extra={"check_id": str(check_id), "organization_id": str(organization.id)}
             )
@@ -207,6 +397,16 @@ async def get_similarity_check(
                 detail="Check not found"
             )
 
+        # Conditional request support for polling clients
+        etag = _check_etag(check)
+        cache_headers = {
+            "ETag": etag,
+            "Cache-Control": _FINISHED_CACHE_CONTROL if check.is_complete else _POLLING_CACHE_CONTROL
+        }
+        if if_none_match == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+        response.headers.update(cache_headers)
+
         # Build response
         response_data = {
             "check_id": check.id,
@@ -220,64 +420,65 @@ async def get_similarity_check(
             "error_message": check.error_message
         }
 
-        # If completed, include full report
-        if check.status == "completed":
-            # Get matches
-            matches_result = await db.execute(
-                select(Match)
-                .where(Match.check_id == check.id)
-                .order_by(Match.similarity_score.desc())
+        # Checks that haven't completed have no report to assemble. Polling
+        # dominates traffic, so this response is serialized straight from the
+        # dict without a model (asyncpg's UUID type needs converting first)
+        if check.status != "completed":
+            return ORJSONResponse(
+                content={**response_data, "check_id": str(check.id), "report": None},
+                headers=cache_headers
             )
-            matches = matches_result.scalars().all()
 
-            log_info(
-                f"Retrieved {len(matches)} matches for check {check_id}",
-                context="get_similarity_check",
-                extra={"check_id": str(check_id), "match_count": len(matches)}
-            )
+        # Completed: include full report
+        matches = check.matches
 
-            # Build match responses
-            match_responses = []
-            for match in matches:
-                # Parse matched chunks
-                matched_chunks = [
-                    MatchedChunk(**chunk) for chunk in match.matched_chunks[:5]
-                ]
-
-                match_responses.append(
-                    MatchResponse(
-                        source_type=match.source_type,
-                        source_title=match.source_title,
-                        source_identifier=match.source_identifier,
-                        similarity_score=match.similarity_score,
-                        match_count=match.match_count,
-                        max_chunk_similarity=match.max_chunk_similarity,
-                        avg_chunk_similarity=match.avg_chunk_similarity,
-                        snippet=match.snippet,
-                        explanation=match.explanation,
-                        risk_contribution=match.risk_contribution,
-                        matched_chunks=matched_chunks
-                    )
-                )
+        log_info(
+            "Retrieved %d matches for check %s", len(matches), check_id,
+            context="get_similarity_check",
+            extra={"check_id": str(check_id), "match_count": len(matches)}
+        )
 
-            # Generate summary
-            summary = _generate_summary(check, matches)
-
-            # Build report
-            report = SimilarityReport(
-                similarity_score=check.similarity_score or 0.0,
-                risk_level=check.risk_level or "low",
-                match_count=check.match_count,
-                sources_checked=check.sources_checked,
-                matches=match_responses,
-                summary=summary,
-                processing_time_seconds=check.processing_time_seconds,
-                estimated_cost_usd=check.estimated_cost_usd
+        # Build match responses. Rows were written by the worker in this
+        # schema's shape, so they are constructed without re-validation.
+        match_responses = []
+        for match in matches:
+            # Parse matched chunks
+            matched_chunks = [
+                MatchedChunk.model_construct(**chunk) for chunk in match.matched_chunks[:5]
+            ]
+
+            match_responses.append(
+                MatchResponse.model_construct(
+                    source_type=match.source_type,
+                    source_title=match.source_title,
+                    source_identifier=match.source_identifier,
+                    similarity_score=match.similarity_score,
+                    match_count=match.match_count,
+                    max_chunk_similarity=match.max_chunk_similarity,
+                    avg_chunk_similarity=match.avg_chunk_similarity,
+                    snippet=match.snippet,
+                    explanation=match.explanation,
+                    risk_contribution=match.risk_contribution,
+                    matched_chunks=matched_chunks
+                )
             )
 
-            response_data["report"] = report
+        # Generate summary
+        summary = _generate_summary(check, matches)
+
+        # Build report
+        report = SimilarityReport(
+            similarity_score=check.similarity_score or 0.0,
+            risk_level=check.risk_level or "low",
+            match_count=check.match_count,
+            sources_checked=check.sources_checked,
+            matches=match_responses,
+            summary=summary,
+            processing_time_seconds=check.processing_time_seconds,
+            estimated_cost_usd=check.estimated_cost_usd
+        )
 
-        return CheckResponse(**response_data)
+        return CheckResponse(report=report, **response_data)
 
     except HTTPException:
         # Re-raise HTTP exceptions (404, etc.)
@@ -308,22 +509,22 @@ async def get_similarity_check(
         )
 
 
+def _check_etag(check: Check) -> str:
+    """
+    Build an ETag for a check from the fields that change as it progresses.
+
+    Args:
+        check: Check object
+
+    Returns:
+        Quoted ETag value
+    """
+    version = f"{check.id}:{check.status}:{check.started_at}:{check.completed_at}"
+    return '"' + hashlib.md5(version.encode()).hexdigest() + '"'
+
+
 def _generate_summary(check: Check, matches: list) -> str:
     """Generate human-readable summary."""
-    if check.risk_level == "low":
-        return (
-            f"Analysis complete. Your content shows low similarity to existing sources. "
-            f"Found {check.match_count} minor matches across {check.sources_checked} sources checked."
-        )
-    elif check.risk_level == "medium":
-        return (
-            f"Analysis complete. Your content shows moderate similarity to existing sources. "
-            f"Found {check.match_count} matches across {check.sources_checked} sources. "
-            f"Review the highlighted sections for editorial considerations."
-        )
-    else:  # high
-        return (
-            f"Analysis complete. Your content shows high similarity to existing sources. "
-            f"Found {check.match_count} significant matches across {check.sources_checked} sources. "
-            f"We recommend reviewing these matches carefully before publication."
-        )
+    # Anything other than low/medium (including a missing level) reads as high
+    template = _SUMMARY_TEMPLATES.get(check.risk_level, _SUMMARY_TEMPLATES["high"])
+    return template.format(count=check.match_count, sources=check.sources_checked)
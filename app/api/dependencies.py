@@ -39,12 +39,8 @@ async def get_current_organization(
     db: AsyncSession = Depends(get_db)
 ) -> Organization:
     """Get organization from validated API key."""
-    from sqlalchemy import select
-
-    result = await db.execute(
-        select(Organization).where(Organization.id == api_key.organization_id)
-    )
-    organization = result.scalar_one_or_none()
+    # Served from the identity map when get_api_key_from_db joined it in
+    organization = await db.get(Organization, api_key.organization_id)
 
     if not organization:
         raise HTTPException(
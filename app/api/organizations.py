@@ -5,6 +5,7 @@ import secrets
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
 from app.models.organization import Organization
@@ -31,6 +32,58 @@ from app.auth.api_key import hash_api_key
 
 router = APIRouter(prefix="/organizations", tags=["Organizations"])
 
+# Unique index enforcing one organization per email
+_EMAIL_INDEX = "ix_organizations_email"
+
+
+async def _commit_organization(db: AsyncSession, email_taken_detail: str) -> None:
+    """
+    Commit organization changes, mapping an email collision to a 400.
+
+    Email uniqueness is enforced by the unique index rather than checked
+    up front, which saves a query and closes the check-then-write race.
+
+    Args:
+        db: Database session
+        email_taken_detail: Error detail when the email is already in use
+
+    Raises:
+        HTTPException: If another organization already uses the email
+    """
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _EMAIL_INDEX in str(e.orig):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=email_taken_detail
+            )
+        raise
+
+
+def _organization_counts(organization_id):
+    """
+    Build scalar subqueries counting an organization's users, API keys and checks.
+
+    Args:
+        organization_id: Organization ID or column to correlate against
+
+    Returns:
+        Tuple of (user count, API key count, total checks) subqueries
+    """
+    return (
+        select(func.count(User.id))
+        .where(User.organization_id == organization_id)
+        .scalar_subquery(),
+        select(func.count(APIKey.id))
+        .where(APIKey.organization_id == organization_id)
+        .scalar_subquery(),
+        select(func.count(Check.id))
+        .where(Check.organization_id == organization_id)
+        .scalar_subquery(),
+    )
+
 
 @router.get("/current", response_model=OrganizationDetailResponse)
 async def get_current_organization(
@@ -42,30 +95,17 @@ async def get_current_organization(
 
     Returns detailed organization information including usage stats.
     """
-    # Get counts
-    user_count_result = await db.execute(
-        select(func.count(User.id))
-        .where(User.organization_id == organization.id)
-    )
-    user_count = user_count_result.scalar() or 0
-
-    api_key_count_result = await db.execute(
-        select(func.count(APIKey.id))
-        .where(APIKey.organization_id == organization.id)
-    )
-    api_key_count = api_key_count_result.scalar() or 0
-
-    total_checks_result = await db.execute(
-        select(func.count(Check.id))
-        .where(Check.organization_id == organization.id)
-    )
-    total_checks = total_checks_result.scalar() or 0
-
-    return OrganizationDetailResponse(
-        **organization.__dict__,
-        user_count=user_count,
-        api_key_count=api_key_count,
-        total_checks=total_checks
+    # Get all counts in one round-trip
+    result = await db.execute(select(*_organization_counts(organization.id)))
+    user_count, api_key_count, total_checks = result.one()
+
+    # Validate straight from the ORM attributes, then attach the counts
+    return OrganizationDetailResponse.model_validate(organization).model_copy(
+        update={
+            "user_count": user_count,
+            "api_key_count": api_key_count,
+            "total_checks": total_checks
+        }
     )
 
 
@@ -88,17 +128,6 @@ async def update_current_organization(
         organization.name = org_data.name
 
     if org_data.email is not None:
-        # Check email uniqueness
-        result = await db.execute(
-            select(Organization)
-            .where(Organization.email == org_data.email)
-            .where(Organization.id != organization.id)
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already in use by another organization"
-            )
         organization.email = org_data.email
 
     if org_data.allow_corpus_inclusion is not None:
@@ -109,8 +138,7 @@ async def update_current_organization(
 
     organization.updated_at = datetime.utcnow()
 
-    await db.commit()
-    await db.refresh(organization)
+    await _commit_organization(db, "Email already in use by another organization")
 
     return OrganizationResponse.model_validate(organization)
 
@@ -130,22 +158,26 @@ async def list_organizations(
 
     Returns paginated list of all organizations in the system.
     """
-    # Count total
-    total_result = await db.execute(select(func.count(Organization.id)))
-    total = total_result.scalar() or 0
-
-    # Get organizations
+    # Get one page of organizations with the total count windowed onto each row
     offset = (page - 1) * page_size
     result = await db.execute(
-        select(Organization)
+        select(Organization, func.count().over().label("total"))
         .order_by(Organization.created_at.desc())
         .offset(offset)
         .limit(page_size)
     )
-    organizations = result.scalars().all()
+    rows = result.all()
+
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Past the last page: no row to carry the count
+        total = await db.scalar(select(func.count(Organization.id))) or 0
+    else:
+        total = 0
 
     return OrganizationListResponse(
-        organizations=[OrganizationResponse.model_validate(org) for org in organizations],
+        organizations=[OrganizationResponse.model_validate(row.Organization) for row in rows],
         total=total,
         page=page,
         page_size=page_size
@@ -165,16 +197,6 @@ async def create_organization(
 
     Creates a new organization with specified settings.
     """
-    # Check email uniqueness
-    result = await db.execute(
-        select(Organization).where(Organization.email == org_data.email)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
     # Create organization
     organization = Organization(
         name=org_data.name,
@@ -185,8 +207,7 @@ async def create_organization(
     )
 
     db.add(organization)
-    await db.commit()
-    await db.refresh(organization)
+    await _commit_organization(db, "Email already registered")
 
     return OrganizationResponse.model_validate(organization)
 
@@ -202,41 +223,28 @@ async def get_organization(
 
     **Requires**: Superuser role
     """
+    # Load the organization and its counts in one round-trip
     result = await db.execute(
-        select(Organization).where(Organization.id == organization_id)
+        select(Organization, *_organization_counts(Organization.id))
+        .where(Organization.id == organization_id)
     )
-    organization = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not organization:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found"
         )
 
-    # Get counts
-    user_count_result = await db.execute(
-        select(func.count(User.id))
-        .where(User.organization_id == organization.id)
-    )
-    user_count = user_count_result.scalar() or 0
+    organization, user_count, api_key_count, total_checks = row
 
-    api_key_count_result = await db.execute(
-        select(func.count(APIKey.id))
-        .where(APIKey.organization_id == organization.id)
-    )
-    api_key_count = api_key_count_result.scalar() or 0
-
-    total_checks_result = await db.execute(
-        select(func.count(Check.id))
-        .where(Check.organization_id == organization.id)
-    )
-    total_checks = total_checks_result.scalar() or 0
-
-    return OrganizationDetailResponse(
-        **organization.__dict__,
-        user_count=user_count,
-        api_key_count=api_key_count,
-        total_checks=total_checks
+    # Validate straight from the ORM attributes, then attach the counts
+    return OrganizationDetailResponse.model_validate(organization).model_copy(
+        update={
+            "user_count": user_count,
+            "api_key_count": api_key_count,
+            "total_checks": total_checks
+        }
     )
 
 
@@ -270,16 +278,6 @@ async def update_organization(
         organization.name = org_data.name
 
     if org_data.email is not None:
-        result = await db.execute(
-            select(Organization)
-            .where(Organization.email == org_data.email)
-            .where(Organization.id != organization_id)
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already in use"
-            )
         organization.email = org_data.email
 
     if org_data.tier is not None:
@@ -299,8 +297,7 @@ async def update_organization(
 
     organization.updated_at = datetime.utcnow()
 
-    await db.commit()
-    await db.refresh(organization)
+    await _commit_organization(db, "Email already in use")
 
     return OrganizationResponse.model_validate(organization)
 
@@ -338,6 +335,8 @@ async def delete_organization(
 # API Key Management
 @router.get("/current/api-keys", response_model=APIKeyListResponse)
 async def list_api_keys(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_current_admin_user),
     organization: Organization = Depends(get_user_organization),
     db: AsyncSession = Depends(get_db)
@@ -347,20 +346,35 @@ async def list_api_keys(
 
     **Requires**: Admin role
 
-    Returns all API keys (without the actual key values).
+    Returns a paginated list of API keys (without the actual key values).
     """
+    # Get one page of keys with the total count windowed onto each row
+    offset = (page - 1) * page_size
     result = await db.execute(
-        select(APIKey)
+        select(APIKey, func.count().over().label("total"))
         .where(APIKey.organization_id == organization.id)
         .order_by(APIKey.created_at.desc())
+        .offset(offset)
+        .limit(page_size)
     )
-    api_keys = result.scalars().all()
-
-    total = len(api_keys)
+    rows = result.all()
+
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Past the last page: no row to carry the count
+        total = await db.scalar(
+            select(func.count(APIKey.id))
+            .where(APIKey.organization_id == organization.id)
+        ) or 0
+    else:
+        total = 0
 
     return APIKeyListResponse(
-        api_keys=[APIKeyResponse.model_validate(key) for key in api_keys],
-        total=total
+        api_keys=[APIKeyResponse.model_validate(row.APIKey) for row in rows],
+        total=total,
+        page=page,
+        page_size=page_size
     )
 
 
@@ -402,7 +416,6 @@ async def create_api_key(
 
     db.add(api_key)
     await db.commit()
-    await db.refresh(api_key)
 
     # Return response with full key (only time it's shown)
     response = APIKeyResponse.model_validate(api_key)
@@ -1,11 +1,13 @@
 """User management endpoints."""
+from typing import Optional, Set
 from uuid import UUID
 from datetime import datetime
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select, delete, exists, func, literal, union_all, bindparam, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.database import get_db
 from app.models.user import User
@@ -15,8 +17,14 @@ from app.schemas.user import (
     UserResponse,
     UserListResponse
 )
-from app.auth.dependencies import get_current_user, get_current_admin_user
-from app.auth.jwt import get_password_hash
+from app.auth.dependencies import (
+    TokenClaims,
+    get_current_user,
+    get_current_admin_user,
+    get_current_admin_claims
+)
+from app.auth.jwt import hash_password_async
+from app.core.user_cache import invalidate_user
 from app.utils.sanitization import sanitize_text
 from app.utils.error_handling import (
     ValidationError,
@@ -29,12 +37,75 @@ from app.utils.error_handling import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/users", tags=["User Management"])
 
+# Reports which of email/username another user already has, in one query.
+_USER_CONFLICTS_STMT = union_all(
+    select(literal("email")).where(
+        User.email == bindparam("email"),
+        User.id.is_distinct_from(bindparam("user_id"))
+    ),
+    select(literal("username")).where(
+        User.username == bindparam("username"),
+        User.id.is_distinct_from(bindparam("user_id"))
+    ),
+)
+
+_DELETE_USER_STMT = (
+    delete(User)
+    .where(User.id == bindparam("user_id"))
+    .where(User.organization_id == bindparam("organization_id"))
+    .returning(User.id)
+    .execution_options(synchronize_session=False)
+)
+_USER_EXISTS_STMT = select(exists().where(User.id == bindparam("user_id")))
+
+# Unique indexes backing the conflict check
+_UNIQUE_INDEX_DETAILS = {
+    "ix_users_email": "Email already registered",
+    "ix_users_username": "Username already taken",
+}
+
+
+async def _find_user_conflicts(
+    db: AsyncSession,
+    email: Optional[str],
+    username: Optional[str],
+    user_id: Optional[UUID] = None
+) -> Set[str]:
+    """
+    Find which of an email and username are used by another user.
+
+    Args:
+        db: Database session
+        email: Email to check (None to skip)
+        username: Username to check (None to skip)
+        user_id: User being updated, excluded from the check
+
+    Returns:
+        Set containing "email" and/or "username"
+    """
+    result = await db.execute(
+        _USER_CONFLICTS_STMT,
+        {"email": email, "username": username, "user_id": user_id}
+    )
+    return set(result.scalars().all())
+
+
+def _unique_violation_detail(error: IntegrityError) -> Optional[str]:
+    """Map a unique index violation on users to its 400 message, if any."""
+    message = str(error.orig)
+    for index_name, detail in _UNIQUE_INDEX_DETAILS.items():
+        if index_name in message:
+            return detail
+    return None
+
 
 @router.get("", response_model=UserListResponse)
 async def list_users(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(get_current_admin_user),
+    after: Optional[datetime] = Query(None, description="Cursor: next_after from the previous page"),
+    after_id: Optional[UUID] = Query(None, description="Cursor: next_after_id from the previous page"),
+    current_user: TokenClaims = Depends(get_current_admin_claims),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -42,32 +113,59 @@ async def list_users(
 
     **Requires**: Admin role
 
-    Returns paginated list of users.
+    Returns paginated list of users, newest first. Pass the previous page's
+    next_after/next_after_id to seek straight to the following page (page
+    is then ignored and total is not computed).
     """
-    # Count total users
-    total_result = await db.execute(
-        select(func.count(User.id))
-        .where(User.organization_id == current_user.organization_id)
-    )
-    total = total_result.scalar() or 0
+    if (after is None) != (after_id is None):
+        raise ValidationError("after and after_id must be given together", field="after")
 
-    # Get users
-    offset = (page - 1) * page_size
-    result = await db.execute(
+    query = (
         select(User)
         .where(User.organization_id == current_user.organization_id)
-        .order_by(User.created_at.desc())
-        .offset(offset)
+        .order_by(User.created_at.desc(), User.id.desc())
         .limit(page_size)
     )
-    users = result.scalars().all()
 
-    return UserListResponse(
-        users=[UserResponse.model_validate(user) for user in users],
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    if after is not None:
+        # Seek past the cursor: cost does not grow with depth
+        result = await db.execute(
+            query.where(tuple_(User.created_at, User.id) < tuple_(after, after_id))
+        )
+        users = result.scalars().all()
+        total = None
+    else:
+        # Get one page of users with the total count windowed onto each row
+        offset = (page - 1) * page_size
+        result = await db.execute(
+            query.add_columns(func.count().over().label("total")).offset(offset)
+        )
+        rows = result.all()
+        users = [row.User for row in rows]
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page: no row to carry the count
+            total = await db.scalar(
+                select(func.count(User.id))
+                .where(User.organization_id == current_user.organization_id)
+            ) or 0
+        else:
+            total = 0
+
+    # A full page may have more after it
+    last = users[-1] if len(users) == page_size else None
+
+    # response_model validates the ORM rows in a single pass
+    return {
+        "users": users,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_after": last.created_at if last else None,
+        "next_after_id": last.id if last else None
+    }
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -84,7 +182,7 @@ async def create_user(
     Creates a new user with the specified role (admin, member, or viewer).
     """
     log_info(
-        f"Creating new user: {user_data.email}",
+        "Creating new user: %s", user_data.email,
         context="create_user",
         extra={
             "admin_user_id": str(current_user.id),
@@ -106,52 +204,52 @@ async def create_user(
         if not username or len(username) < 3:
             raise ValidationError("Username must be at least 3 characters", field="username")
 
-        # Check if email already exists
+        # Insert, letting the unique indexes reject duplicates: one round
+        # trip on the happy path and no check-then-insert race
+        hashed_password = await hash_password_async(user_data.password)
         result = await db.execute(
-            select(User).where(User.email == email)
-        )
-        if result.scalar_one_or_none():
-            log_warning(
-                f"User creation failed: Email already exists - {email}",
-                context="create_user"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
+            pg_insert(User)
+            .values(
+                organization_id=current_user.organization_id,
+                email=email,
+                username=username,
+                hashed_password=hashed_password,
+                full_name=full_name,
+                role=user_data.role,
+                is_active=True
             )
-
-        # Check if username already exists
-        result = await db.execute(
-            select(User).where(User.username == username)
+            .on_conflict_do_nothing()
+            .returning(User)
         )
-        if result.scalar_one_or_none():
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            # Only now find out which field collided, for the message
+            conflicts = await _find_user_conflicts(db, email, username)
+
+            if "username" in conflicts and "email" not in conflicts:
+                log_warning(
+                    "User creation failed: Username already taken - %s", username,
+                    context="create_user"
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Username already taken"
+                )
+
             log_warning(
-                f"User creation failed: Username already taken - {username}",
+                "User creation failed: Email already exists - %s", email,
                 context="create_user"
             )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken"
+                detail="Email already registered"
             )
 
-        # Create user
-        hashed_password = get_password_hash(user_data.password)
-        user = User(
-            organization_id=current_user.organization_id,
-            email=email,
-            username=username,
-            hashed_password=hashed_password,
-            full_name=full_name,
-            role=user_data.role,
-            is_active=True
-        )
-
-        db.add(user)
         await db.commit()
-        await db.refresh(user)
 
         log_info(
-            f"User created successfully: {user.id}",
+            "User created successfully: %s", user.id,
             context="create_user",
             extra={
                 "user_id": str(user.id),
@@ -160,7 +258,7 @@ async def create_user(
             }
         )
 
-        return UserResponse.model_validate(user)
+        return user
 
     except (ValidationError, HTTPException):
         raise
@@ -200,10 +298,8 @@ async def get_user(
 
     Users can view their own profile or admins can view any user in their organization.
     """
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    # Primary-key lookup; served from the identity map for the current user
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -225,7 +321,7 @@ async def get_user(
             detail="Access denied"
         )
 
-    return UserResponse.model_validate(user)
+    return user
 
 
 @router.patch("/{user_id}", response_model=UserResponse)
@@ -243,16 +339,14 @@ async def update_user(
     Admins can update any user in their organization.
     """
     log_info(
-        f"Updating user: {user_id}",
+        "Updating user: %s", user_id,
         context="update_user",
         extra={"admin_user_id": str(current_user.id), "target_user_id": str(user_id)}
     )
 
     try:
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        # Primary-key lookup; served from the identity map for the current user
+        user = await db.get(User, user_id)
 
         if not user:
             raise HTTPException(
@@ -267,43 +361,38 @@ async def update_user(
                 detail="Access denied"
             )
 
-        # Update fields
+        # Sanitize and validate identity fields
+        email = None
         if user_data.email is not None:
-            # Sanitize email
             email = sanitize_text(user_data.email, max_length=255).strip().lower()
-
-            # Validate email
             if not email or '@' not in email:
                 raise ValidationError("Invalid email format", field="email")
 
-            # Check email uniqueness
-            result = await db.execute(
-                select(User).where(User.email == email).where(User.id != user_id)
-            )
-            if result.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already in use"
-                )
-            user.email = email
-
+        username = None
         if user_data.username is not None:
-            # Sanitize username
             username = sanitize_text(user_data.username, max_length=100).strip()
-
-            # Validate username
             if not username or len(username) < 3:
                 raise ValidationError("Username must be at least 3 characters", field="username")
 
-            # Check username uniqueness
-            result = await db.execute(
-                select(User).where(User.username == username).where(User.id != user_id)
-            )
-            if result.scalar_one_or_none():
+        # Check email and username uniqueness in one query
+        if email is not None or username is not None:
+            conflicts = await _find_user_conflicts(db, email, username, user_id)
+            if "email" in conflicts:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Email already in use"
+                )
+            if "username" in conflicts:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Username already taken"
                 )
+
+        # Update fields
+        if email is not None:
+            user.email = email
+
+        if username is not None:
             user.username = username
 
         if user_data.full_name is not None:
@@ -315,22 +404,31 @@ async def update_user(
         if user_data.is_active is not None:
             user.is_active = user_data.is_active
 
-        user.updated_at = datetime.utcnow()
-
         await db.commit()
-        await db.refresh(user)
+        await invalidate_user(user.id)
 
         log_info(
-            f"User updated successfully: {user.id}",
+            "User updated successfully: %s", user.id,
             context="update_user",
             extra={"user_id": str(user.id), "admin_user_id": str(current_user.id)}
         )
 
-        return UserResponse.model_validate(user)
+        return user
 
     except (ValidationError, HTTPException):
         raise
 
+    except IntegrityError as e:
+        # A concurrent request took the email or username after the check
+        detail = _unique_violation_detail(e)
+        if detail is None:
+            log_error(e, context="update_user", user_id=str(current_user.id), extra={"error_type": "database"})
+            raise DatabaseError(
+                "Failed to update user due to database error",
+                details={"error": str(e)}
+            )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
     except SQLAlchemyError as e:
         log_error(
             e,
@@ -369,32 +467,32 @@ async def delete_user(
 
     **Warning**: This action cannot be undone.
     """
+    # Prevent self-deletion
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete your own account"
+        )
+
+    # Delete in one statement, scoped to the admin's organization
     result = await db.execute(
-        select(User).where(User.id == user_id)
+        _DELETE_USER_STMT,
+        {"user_id": user_id, "organization_id": current_user.organization_id}
     )
-    user = result.scalar_one_or_none()
 
-    if not user:
+    if result.scalar_one_or_none() is None:
+        # Nothing deleted: tell a missing user from one in another organization
+        if await db.scalar(_USER_EXISTS_STMT, {"user_id": user_id}):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    # Check same organization
-    if user.organization_id != current_user.organization_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-
-    # Prevent self-deletion
-    if user.id == current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot delete your own account"
-        )
-
-    await db.delete(user)
     await db.commit()
+    await invalidate_user(user_id)
 
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
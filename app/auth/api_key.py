@@ -1,22 +1,56 @@
 """API key authentication and management."""
+import asyncio
+import hashlib
+import hmac
 import secrets
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
+from cachetools import TTLCache
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
+from sqlalchemy.orm import joinedload
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
+from app.config import settings
 from app.models.api_key import APIKey
 from app.models.organization import Organization
+from app.core.rate_limit import record_request
 
-# Password context for hashing API keys
+# Bcrypt context, only needed to verify keys issued before keyed hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# HMAC key for API key hashes
+_API_KEY_PEPPER = settings.api_key_pepper.encode()
+
+# Hashes of keys that recently failed lookup, so repeated bad keys are
+# rejected without touching the database (or bcrypt, via legacy candidates).
+# Only read and written on the event loop, so no lock is needed.
+_invalid_key_cache: TTLCache = TTLCache(maxsize=50_000, ttl=60)
+
+# One legacy-candidate verification per key hash at a time; concurrent
+# requests with the same unknown key wait and then hit the cache above
+_legacy_lookup_locks: Dict[str, asyncio.Lock] = {}
+
 # API key header
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=True)
 
+# The organization is joined in so the quota and organization checks that
+# follow need no extra query.
+_API_KEY_BY_HASH_STMT = (
+    select(APIKey)
+    .options(joinedload(APIKey.organization))
+    .where(APIKey.key_hash == bindparam("key_hash"))
+    .where(APIKey.is_active == True)
+)
+_API_KEYS_BY_PREFIX_STMT = (
+    select(APIKey)
+    .options(joinedload(APIKey.organization))
+    .where(APIKey.key_prefix == bindparam("key_prefix"))
+    .where(APIKey.is_active == True)
+)
+
 
 def generate_api_key() -> Tuple[str, str]:
     """
@@ -27,24 +61,41 @@ def generate_api_key() -> Tuple[str, str]:
     """
     # Generate a random key
     raw_key = f"sk_live_{secrets.token_urlsafe(32)}"
-    # Truncate to 72 bytes for bcrypt
-    raw_key_trunc = raw_key[:72]
-    key_hash = pwd_context.hash(raw_key_trunc)
-    return raw_key, key_hash
+    return raw_key, hash_api_key(raw_key)
 
 
 def hash_api_key(raw_key: str) -> str:
     """
     Hash an API key.
 
+    Keys carry 256 bits of randomness, so a fast keyed HMAC-SHA256 is as
+    safe as a slow password KDF, costs well under a microsecond and gives a
+    deterministic value that can be looked up through the unique index.
+
     Args:
         raw_key: Raw API key
 
     Returns:
-        Hashed API key
+        Hex-encoded HMAC-SHA256 of the key
     """
-    # Truncate to 72 bytes for bcrypt
-    return pwd_context.hash(raw_key[:72])
+    return hmac.new(_API_KEY_PEPPER, raw_key.encode(), hashlib.sha256).hexdigest()
+
+
+def _verify_legacy_api_key(raw_key: str, key_hash: str) -> bool:
+    """
+    Verify an API key against a hash in a pre-HMAC format.
+
+    Args:
+        raw_key: Raw API key
+        key_hash: Bcrypt hash or unkeyed SHA-256 digest
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if key_hash.startswith("$2"):
+        # Bcrypt (truncated to 72 bytes when it was created)
+        return pwd_context.verify(raw_key[:72], key_hash)
+    return hmac.compare_digest(hashlib.sha256(raw_key.encode()).hexdigest(), key_hash)
 
 
 def verify_api_key(raw_key: str, key_hash: str) -> bool:
@@ -53,12 +104,15 @@ def verify_api_key(raw_key: str, key_hash: str) -> bool:
 
     Args:
         raw_key: Raw API key
-        key_hash: Hashed API key
+        key_hash: Hashed API key (HMAC-SHA256, or a legacy format)
 
     Returns:
         True if valid, False otherwise
     """
-    return pwd_context.verify(raw_key, key_hash)
+    return (
+        hmac.compare_digest(hash_api_key(raw_key), key_hash)
+        or _verify_legacy_api_key(raw_key, key_hash)
+    )
 
 
 async def get_api_key_from_db(
@@ -75,25 +129,59 @@ async def get_api_key_from_db(
     Returns:
         APIKey object or None
     """
-    # Extract prefix for efficient lookup
-    prefix = raw_key[:15] if len(raw_key) > 15 else raw_key
+    # The hash is deterministic, so the key is found with one unique index
+    # lookup and needs no further verification
+    key_hash = hash_api_key(raw_key)
+    if key_hash in _invalid_key_cache:
+        return None
+
+    result = await db.execute(_API_KEY_BY_HASH_STMT, {"key_hash": key_hash})
+    api_key = result.scalar_one_or_none()
+    if api_key:
+        return api_key
+
+    lock = _legacy_lookup_locks.setdefault(key_hash, asyncio.Lock())
+    try:
+        async with lock:
+            # A concurrent request may have just ruled this key out
+            if key_hash in _invalid_key_cache:
+                return None
+
+            api_key = await _find_legacy_api_key(db, raw_key, key_hash)
+            if api_key is None:
+                _invalid_key_cache[key_hash] = True
+            return api_key
+    finally:
+        if not lock.locked():
+            _legacy_lookup_locks.pop(key_hash, None)
 
-    # Query for API keys with matching prefix
-    result = await db.execute(
-        select(APIKey)
-        .where(APIKey.key_prefix == prefix)
-        .where(APIKey.is_active == True)
-    )
-    api_keys = result.scalars().all()
-
-    # Verify hash for each candidate
-    for api_key in api_keys:
-        if verify_api_key(raw_key, api_key.key_hash):
-            # Update last used timestamp
-            api_key.last_used_at = datetime.utcnow()
-            api_key.total_requests += 1
+
+async def _find_legacy_api_key(
+    db: AsyncSession,
+    raw_key: str,
+    key_hash: str
+) -> Optional[APIKey]:
+    """
+    Find an API key stored with a pre-HMAC hash and upgrade its hash.
+
+    Args:
+        db: Database session
+        raw_key: Raw API key from request
+        key_hash: HMAC-SHA256 of the key to store on a match
+
+    Returns:
+        APIKey object or None
+    """
+    # Keys issued before keyed hashing: find candidates by prefix, verify
+    # the old hash and upgrade it so the next request takes the fast path
+    prefix = raw_key[:15] if len(raw_key) > 15 else raw_key
+    result = await db.execute(_API_KEYS_BY_PREFIX_STMT, {"key_prefix": prefix})
+    for candidate in result.scalars().all():
+        # Bcrypt takes tens of milliseconds; keep it off the event loop
+        if await asyncio.to_thread(_verify_legacy_api_key, raw_key, candidate.key_hash):
+            candidate.key_hash = key_hash
             await db.commit()
-            return api_key
+            return candidate
 
     return None
 
@@ -156,11 +244,8 @@ async def get_current_organization(
     Raises:
         HTTPException: If organization is inactive
     """
-    result = await db.execute(
-        select(Organization)
-        .where(Organization.id == api_key.organization_id)
-    )
-    organization = result.scalar_one_or_none()
+    # Served from the identity map when get_api_key_from_db joined it in
+    organization = await db.get(Organization, api_key.organization_id)
 
     if not organization:
         raise HTTPException(
@@ -191,11 +276,23 @@ async def check_rate_limit(
     Raises:
         HTTPException: If rate limit exceeded
     """
-    # Simple rate limiting - check requests in last minute
-    # In production, use Redis for distributed rate limiting
+    # Count the request in Redis; usage is written back to the api_keys
+    # row by a periodic task rather than with an UPDATE per request
+    request_count = await record_request(api_key.id)
+
+    if request_count is None:
+        # Redis unavailable: record usage directly and skip the per-minute limit
+        api_key.last_used_at = datetime.utcnow()
+        api_key.total_requests += 1
+        await db.commit()
+    elif request_count > api_key.rate_limit_per_minute:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit ({api_key.rate_limit_per_minute} requests per minute) exceeded",
+            headers={"Retry-After": "60"}
+        )
 
-    # For MVP, skip detailed rate limiting
-    # Just check monthly quota
+    # Check monthly quota
     organization = await get_current_organization(api_key, db)
 
     if organization.current_month_checks >= organization.monthly_check_limit:
@@ -239,6 +336,5 @@ async def create_api_key(
 
     db.add(api_key)
     await db.commit()
-    await db.refresh(api_key)
 
     return raw_key, api_key
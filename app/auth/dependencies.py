@@ -1,18 +1,28 @@
 """Authentication dependencies for protected routes."""
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
+from sqlalchemy.orm import joinedload, make_transient_to_detached
 from uuid import UUID
 
 from app.database import get_db
 from app.models.user import User
 from app.models.organization import Organization
-from app.auth.jwt import decode_access_token
+from app.auth.jwt import decode_access_token, CLAIMS_VERSION
+from app.core.user_cache import get_cached_user, cache_user
 
 
 security = HTTPBearer()
 
+# Organization is joined in so get_user_organization needs no extra query.
+_USER_WITH_ORGANIZATION_STMT = (
+    select(User)
+    .options(joinedload(User.organization))
+    .where(User.id == bindparam("user_id"))
+)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -51,16 +61,24 @@ async def get_current_user(
             detail="Invalid user ID in token"
         )
 
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+    cached = await get_cached_user(user_id)
+    if cached is not None:
+        # Attach the cached row to the session without a SELECT; unloaded
+        # columns (the password hash) load on refresh like any expired one
+        user = User(**cached)
+        make_transient_to_detached(user)
+        user = await db.merge(user, load=False)
+    else:
+        result = await db.execute(_USER_WITH_ORGANIZATION_STMT, {"user_id": user_id})
+        user = result.scalar_one_or_none()
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+
+        await cache_user(user)
 
     if not user.is_active:
         raise HTTPException(
@@ -71,40 +89,103 @@ async def get_current_user(
     return user
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Get current active user."""
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user"
-        )
-    return current_user
+def require_role(*, admin: bool = False, superuser: bool = False):
+    """
+    Build a dependency returning the current user if they hold a role.
 
+    get_current_user already rejects inactive users, so this adds a
+    single role check on top of it rather than another dependency layer.
 
-async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Get current user (must be admin)."""
-    if not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin privileges required"
-        )
-    return current_user
+    Args:
+        admin: Require admin privileges (superusers qualify)
+        superuser: Require superuser privileges
+
+    Returns:
+        FastAPI dependency
+    """
+    async def dependency(current_user: User = Depends(get_current_user)) -> User:
+        if superuser and not current_user.is_superuser:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Superuser privileges required"
+            )
+        if admin and not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin privileges required"
+            )
+        return current_user
+
+    return dependency
+
+
+# Named role dependencies used by the routers
+get_current_active_user = get_current_user
+get_current_admin_user = require_role(admin=True)
+get_current_superuser = require_role(superuser=True)
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Authorization facts about the current user, as signed into their token."""
+    id: UUID
+    organization_id: UUID
+    role: str
+    is_superuser: bool
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user is an admin."""
+        return self.role == "admin" or self.is_superuser
+
+
+async def get_current_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> TokenClaims:
+    """
+    Get the current user's identity and role from the JWT alone.
 
+    For routes that only need the user's ID, organization and role this
+    skips loading the user entirely. The claims are as of when the token
+    was issued, so role changes and deactivation take effect when the
+    token expires. Tokens without current claims fall back to
+    get_current_user.
+    """
+    payload = decode_access_token(credentials.credentials)
+    if payload and payload.get("v") == CLAIMS_VERSION:
+        try:
+            return TokenClaims(
+                id=UUID(payload["user_id"]),
+                organization_id=UUID(payload["organization_id"]),
+                role=payload["role"],
+                is_superuser=bool(payload["is_superuser"])
+            )
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload"
+            )
+
+    user = await get_current_user(credentials, db)
+    return TokenClaims(
+        id=user.id,
+        organization_id=user.organization_id,
+        role=user.role,
+        is_superuser=user.is_superuser
+    )
 
-async def get_current_superuser(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Get current user (must be superuser)."""
-    if not current_user.is_superuser:
+
+async def get_current_admin_claims(
+    claims: TokenClaims = Depends(get_current_claims)
+) -> TokenClaims:
+    """Get current user's token claims (must be admin)."""
+    if not claims.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Superuser privileges required"
+            detail="Admin privileges required"
         )
-    return current_user
+    return claims
 
 
 async def get_user_organization(
@@ -112,10 +193,8 @@ async def get_user_organization(
     db: AsyncSession = Depends(get_db)
 ) -> Organization:
     """Get organization for current user."""
-    result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
-    )
-    organization = result.scalar_one_or_none()
+    # Served from the identity map when get_current_user joined it in
+    organization = await db.get(Organization, current_user.organization_id)
 
     if not organization:
         raise HTTPException(
@@ -1,6 +1,12 @@
 """JWT token handling."""
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import hashlib
+import hmac
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from uuid import UUID
@@ -8,7 +14,48 @@ from uuid import UUID
 from app.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds
+)
+
+# Bounds for calibrated bcrypt cost (10 is the lowest cost we accept)
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+
+# Recent successful password verifications, keyed by an HMAC of the
+# (password, hash) pair so plaintext passwords are never kept in memory
+_verify_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_verify_cache_lock = threading.Lock()
+
+# Recently issued access tokens, keyed by their claims, so repeat logins
+# within the window get the same still-valid token back
+_issued_token_cache: TTLCache = TTLCache(maxsize=5_000, ttl=30)
+_issued_token_cache_lock = threading.Lock()
+
+# Recently verified access tokens and their claims, so a client sending the
+# same token on every request pays for signature verification once. Entries
+# are only served until the token's own exp.
+_decoded_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_decoded_token_cache_lock = threading.Lock()
+
+# Settings read on every token mint/verify, resolved once at import
+_SECRET_KEY = settings.secret_key
+_SECRET_KEY_BYTES = _SECRET_KEY.encode()
+_JWT_ALGORITHM = settings.jwt_algorithm
+_JWT_ALGORITHMS = [_JWT_ALGORITHM]
+
+# Minimum remaining lifetime for an issued token to be handed out again
+TOKEN_REUSE_MIN_REMAINING = timedelta(seconds=60)
+
+# Token lifetime used when the caller doesn't pass one
+DEFAULT_TOKEN_TTL = timedelta(hours=1)
+
+# Version of the authorization claims embedded in access tokens. Claims in
+# tokens carrying another version are not trusted; bump it to make every
+# outstanding token fall back to a database lookup.
+CLAIMS_VERSION = 1
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -16,6 +63,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_password_cached(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password, reusing a recent result for the same (password, hash) pair.
+
+    Repeated successful attempts within the cache TTL skip the bcrypt key
+    schedule. Failures are never cached, so a wrong password always costs
+    a full bcrypt run and response time reveals nothing about other
+    clients' recent attempts.
+
+    Args:
+        plain_password: Password supplied by the client
+        hashed_password: Stored password hash
+
+    Returns:
+        True if the password matches the hash
+    """
+    key = hmac.new(
+        _SECRET_KEY_BYTES,
+        f"{plain_password}\x00{hashed_password}".encode(),
+        hashlib.sha256
+    ).digest()
+
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            return True
+
+    if not verify_password(plain_password, hashed_password):
+        return False
+
+    with _verify_cache_lock:
+        _verify_cache[key] = True
+    return True
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password."""
     # Truncate password to 72 bytes for bcrypt compatibility
@@ -23,6 +104,93 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password_trunc)
 
 
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop.
+
+    bcrypt releases the GIL while hashing, so a worker thread is enough to
+    keep other requests on this worker responsive.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Password hash
+    """
+    return await asyncio.to_thread(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password (using the result cache) without blocking the event loop.
+
+    Args:
+        plain_password: Password supplied by the client
+        hashed_password: Stored password hash
+
+    Returns:
+        True if the password matches the hash
+    """
+    return await asyncio.to_thread(verify_password_cached, plain_password, hashed_password)
+
+
+def calibrate_kdf(target_ms: Optional[int] = None) -> int:
+    """
+    Raise the bcrypt cost as far as the target latency allows.
+
+    Picks the largest cost whose estimated hash time is at or below the
+    target, but never less than the configured settings.bcrypt_rounds, so
+    calibration can only strengthen hashing. Each extra round doubles the
+    bcrypt work factor, so the hash time is measured at the minimum cost
+    and extrapolated from there. The chosen cost is stored in settings and
+    applied to the password context.
+
+    Args:
+        target_ms: Target hash time in milliseconds (defaults to settings.bcrypt_target_ms)
+
+    Returns:
+        Selected bcrypt cost
+    """
+    if target_ms is None:
+        target_ms = settings.bcrypt_target_ms
+
+    # Take the best of a few samples so backend loading doesn't skew the result
+    samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        pwd_context.hash("calibration", rounds=MIN_BCRYPT_ROUNDS)
+        samples.append((time.perf_counter() - start) * 1000)
+    base_ms = min(samples)
+
+    rounds = max(MIN_BCRYPT_ROUNDS, settings.bcrypt_rounds)
+    while rounds < MAX_BCRYPT_ROUNDS and base_ms * 2 ** (rounds + 1 - MIN_BCRYPT_ROUNDS) <= target_ms:
+        rounds += 1
+
+    settings.bcrypt_rounds = rounds
+    pwd_context.update(bcrypt__rounds=rounds)
+    return rounds
+
+
+def user_token_claims(user) -> dict:
+    """
+    Build the access token claims for a user.
+
+    Args:
+        user: User the token is issued to
+
+    Returns:
+        Claims to pass to create_access_token
+    """
+    return {
+        "user_id": user.id,
+        "email": user.email,
+        "organization_id": user.organization_id,
+        "role": user.role,
+        "is_superuser": user.is_superuser,
+        "v": CLAIMS_VERSION
+    }
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token.
@@ -34,40 +202,88 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token
     """
-    to_encode = data.copy()
+    # Convert UUIDs to strings (isinstance, since IDs loaded through
+    # asyncpg are a UUID subclass)
+    to_encode = {
+        key: str(value) if isinstance(value, UUID) else value
+        for key, value in data.items()
+    }
 
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(hours=1)
+    # Integer epoch seconds, which is what the claims are encoded as anyway
+    now = int(time.time())
+    to_encode["iat"] = now
+    to_encode["exp"] = now + int((expires_delta or DEFAULT_TOKEN_TTL).total_seconds())
 
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_JWT_ALGORITHM)
+    return encoded_jwt
 
-    # Convert UUIDs to strings
-    for key, value in to_encode.items():
-        if isinstance(value, UUID):
-            to_encode[key] = str(value)
 
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
-    return encoded_jwt
+def create_access_token_cached(
+    data: dict,
+    expires_delta: Optional[timedelta] = None
+) -> Tuple[str, int]:
+    """
+    Create a JWT access token, reusing a recently issued one for the same claims.
+
+    A cached token is only reused while it has more than
+    TOKEN_REUSE_MIN_REMAINING left before it expires.
+
+    Args:
+        data: Data to encode in the token
+        expires_delta: Optional expiration time
+
+    Returns:
+        Tuple of (encoded JWT token, seconds until it expires)
+    """
+    key = tuple(sorted((k, str(v)) for k, v in data.items()))
+    now = datetime.now(timezone.utc)
+
+    with _issued_token_cache_lock:
+        cached = _issued_token_cache.get(key)
+    if cached is not None:
+        token, expire = cached
+        if expire - now > TOKEN_REUSE_MIN_REMAINING:
+            return token, int((expire - now).total_seconds())
+
+    expires_delta = expires_delta or DEFAULT_TOKEN_TTL
+    token = create_access_token(data, expires_delta=expires_delta)
+    expire = now + expires_delta
+
+    with _issued_token_cache_lock:
+        _issued_token_cache[key] = (token, expire)
+    return token, int((expire - now).total_seconds())
 
 
 def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode JWT access token.
 
+    Valid tokens are cached until they expire; invalid ones are not, so
+    garbage tokens cannot crowd out real ones.
+
     Args:
         token: JWT token to decode
 
     Returns:
         Decoded token data or None if invalid
     """
+    # Keyed by a short digest so bearer tokens aren't held in memory
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    with _decoded_token_cache_lock:
+        cached = _decoded_token_cache.get(key)
+    if cached is not None and cached.get("exp", 0) > time.time():
+        return dict(cached)
+
     try:
         payload = jwt.decode(
             token,
-            settings.secret_key,
-            algorithms=[settings.jwt_algorithm]
+            _SECRET_KEY,
+            algorithms=_JWT_ALGORITHMS
         )
-        return payload
     except JWTError:
         return None
+
+    with _decoded_token_cache_lock:
+        _decoded_token_cache[key] = payload
+    return dict(payload)
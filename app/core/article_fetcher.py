@@ -1,62 +1,207 @@
 """Fetch and extract article content from URLs."""
+import asyncio
+import codecs
 import logging
-from typing import Optional, Dict
+import re
+import threading
+import zlib
+from typing import Mapping, Optional, Dict, List
+from urllib.parse import urlsplit
+import httpx
+import redis
 import requests
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
+from cachetools import TTLCache
 from newspaper import Article
-import hashlib
-from datetime import datetime, timedelta
+from redis.exceptions import RedisError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Pages are read up to this many bytes; anything past it is ignored
+MAX_HTML_BYTES = 2_000_000
+
+# Responses declaring a larger body are not articles worth parsing
+MAX_CONTENT_LENGTH = 3_000_000
+
+_HTML_CONTENT_TYPES = frozenset({'text/html', 'application/xhtml+xml'})
+
+# URL paths that point at files rather than pages
+_NON_ARTICLE_PATH_RE = re.compile(
+    r'\.(?:pdf|jpe?g|png|gif|webp|svg|ico|mp[34]|m4a|avi|mov|webm|wav'
+    r'|zip|gz|tgz|tar|rar|7z|exe|dmg|docx?|xlsx?|pptx?)$',
+    re.IGNORECASE
+)
+
+_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Connections kept per host by each fetcher's session
+_POOL_SIZE = 32
+
+# Redis keys for cached article bodies are this prefix plus the URL
+ARTICLE_CACHE_KEY_PREFIX = "art:"
+
+# Elements whose text is never part of the article
+_BOILERPLATE_XPATH = '//script | //style | //nav | //header | //footer | //aside'
+
+
+def _attr_contains(attr: str, value: str) -> str:
+    """Build an XPath matching elements whose attribute contains value, ignoring case."""
+    return (
+        f'//*[contains(translate(@{attr}, "ABCDEFGHIJKLMNOPQRSTUVWXYZ", '
+        f'"abcdefghijklmnopqrstuvwxyz"), "{value}")]'
+    )
+
+
+# Article containers to look for, most specific first
+_ARTICLE_XPATHS = tuple(
+    lxml.etree.XPath(xpath)
+    for xpath in (
+        '//article',
+        _attr_contains('class', 'article'),
+        _attr_contains('class', 'content'),
+        _attr_contains('class', 'post'),
+        _attr_contains('id', 'content'),
+    )
+)
+
+
+def _is_html_response(headers: Mapping[str, str]) -> bool:
+    """
+    Check whether response headers describe an HTML page small enough to parse.
+
+    Missing headers are given the benefit of the doubt.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        False if the body is declared as non-HTML or too large
+    """
+    content_type = headers.get('content-type', '').split(';', 1)[0].strip().lower()
+    if content_type and content_type not in _HTML_CONTENT_TYPES:
+        return False
+
+    content_length = headers.get('content-length', '')
+    return not (content_length.isdigit() and int(content_length) > MAX_CONTENT_LENGTH)
+
 
 class ArticleCache:
-    """Simple in-memory cache for fetched articles."""
+    """
+    Cache for fetched articles shared by all workers through Redis.
+
+    Bodies are stored zlib-compressed in Redis so every worker process
+    reuses an article another one already fetched. A small in-process
+    cache sits in front of Redis and is used alone while Redis is
+    unavailable.
+    """
 
-    def __init__(self, ttl_hours: int = 24):
+    def __init__(self, ttl_hours: int = 24, maxsize: int = 1000):
         """
         Initialize cache.
 
         Args:
             ttl_hours: Time-to-live for cached articles in hours
+            maxsize: Maximum number of articles cached in process; the least
+                recently used are evicted past this, bounding memory use
         """
-        self.cache: Dict[str, Dict] = {}
+        # Keyed by the URL itself; expired entries are evicted on access
+        self.cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_hours * 3600)
         self.ttl_hours = ttl_hours
+        # TTLCache is not thread-safe; fetchers may run in several threads
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+
+    @property
+    def redis(self) -> redis.Redis:
+        """Get the Redis client, connecting on first use."""
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(
+                settings.redis_url,
+                socket_timeout=settings.redis_socket_timeout,
+                socket_connect_timeout=settings.redis_socket_timeout,
+            )
+        return self._redis
 
     def get(self, url: str) -> Optional[str]:
         """Get article from cache if available and not expired."""
-        url_hash = self._hash_url(url)
-
-        if url_hash in self.cache:
-            cached = self.cache[url_hash]
-            # Check if expired
-            if datetime.utcnow() < cached['expires_at']:
-                logger.debug(f"Cache hit for URL: {url[:50]}")
-                return cached['content']
-            else:
-                # Remove expired entry
-                del self.cache[url_hash]
-                logger.debug(f"Cache expired for URL: {url[:50]}")
+        return self.get_many([url]).get(url)
 
-        return None
+    def get_many(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Get several cached articles.
+
+        URLs not cached in process are looked up in one Redis round trip.
+
+        Args:
+            urls: Article URLs
+
+        Returns:
+            Dict mapping URLs to article content (only cache hits)
+        """
+        with self._lock:
+            found = {url: self.cache[url] for url in urls if url in self.cache}
+
+        missing = [url for url in dict.fromkeys(urls) if url not in found]
+        if missing:
+            try:
+                raw_contents = self.redis.mget(
+                    [ARTICLE_CACHE_KEY_PREFIX + url for url in missing]
+                )
+            except RedisError as e:
+                logger.warning("Article cache unavailable, using in-process cache: %s", e)
+                raw_contents = []
+
+            for url, raw in zip(missing, raw_contents):
+                if raw is None:
+                    continue
+                try:
+                    content = zlib.decompress(raw).decode("utf-8")
+                except (zlib.error, UnicodeDecodeError):
+                    # Not written by this cache; treat as a miss
+                    continue
+                found[url] = content
+                with self._lock:
+                    self.cache[url] = content
+
+        for url in found:
+            logger.debug(f"Cache hit for URL: {url[:50]}")
+        return found
 
     def set(self, url: str, content: str):
         """Cache article content."""
-        url_hash = self._hash_url(url)
-        self.cache[url_hash] = {
-            'content': content,
-            'expires_at': datetime.utcnow() + timedelta(hours=self.ttl_hours),
-            'cached_at': datetime.utcnow()
-        }
-        logger.debug(f"Cached article: {url[:50]}")
+        with self._lock:
+            self.cache[url] = content
+
+        try:
+            self.redis.set(
+                ARTICLE_CACHE_KEY_PREFIX + url,
+                zlib.compress(content.encode("utf-8"), 3),
+                ex=self.ttl_hours * 3600
+            )
+        except RedisError as e:
+            logger.warning("Failed to cache article in Redis: %s", e)
 
-    def _hash_url(self, url: str) -> str:
-        """Create hash of URL for cache key."""
-        return hashlib.md5(url.encode()).hexdigest()
+        logger.debug(f"Cached article: {url[:50]}")
 
     def clear(self):
         """Clear all cached articles."""
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
+
+        try:
+            keys = list(self.redis.scan_iter(match=ARTICLE_CACHE_KEY_PREFIX + "*", count=1000))
+            if keys:
+                self.redis.delete(*keys)
+        except RedisError as e:
+            logger.warning("Failed to clear Redis article cache: %s", e)
+
         logger.info("Article cache cleared")
 
 
@@ -78,13 +223,35 @@ class ArticleFetcher:
         self.use_cache = use_cache
         self.timeout = timeout
 
+        # Reuse connections (and TLS sessions) across URLs on the same host
+        # and retry transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_SIZE,
+            pool_maxsize=_POOL_SIZE,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(_REQUEST_HEADERS)
+
+    def __enter__(self) -> "ArticleFetcher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self):
+        """Close the fetcher's pooled connections."""
+        self.session.close()
+
     def fetch_article(self, url: str) -> Optional[str]:
         """
         Fetch article content from URL.
 
         Tries multiple extraction methods:
         1. newspaper3k (best for articles)
-        2. BeautifulSoup fallback (for difficult sites)
+        2. lxml fallback (for difficult sites)
 
         Args:
             url: Article URL
@@ -100,13 +267,17 @@ class ArticleFetcher:
 
         logger.info(f"Fetching article: {url}")
 
+        if not self._looks_like_article(url):
+            logger.debug(f"Skipping non-article URL: {url}")
+            return None
+
         # Try newspaper3k first (best for articles)
         content = self._fetch_with_newspaper(url)
 
-        # Fallback to BeautifulSoup if newspaper fails
+        # Fallback to lxml if newspaper fails
         if not content or len(content) < 100:
-            logger.debug(f"Newspaper extraction failed, trying BeautifulSoup: {url}")
-            content = self._fetch_with_beautifulsoup(url)
+            logger.debug(f"Newspaper extraction failed, trying lxml: {url}")
+            content = self._fetch_with_lxml(url)
 
         # Cache successful fetch
         if content and self.use_cache:
@@ -119,6 +290,31 @@ class ArticleFetcher:
 
         return content
 
+    def _looks_like_article(self, url: str) -> bool:
+        """
+        Cheaply rule out URLs that are not HTML articles before downloading.
+
+        Rejects file extensions outright, then issues a HEAD request and
+        checks the declared type and size. A failed HEAD (some servers
+        refuse it) does not reject the URL.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            False if the URL is known not to be an article
+        """
+        if _NON_ARTICLE_PATH_RE.search(urlsplit(url).path):
+            return False
+
+        try:
+            response = self.session.head(url, timeout=min(self.timeout, 3), allow_redirects=True)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"HEAD request failed for {url}: {e}")
+            return True
+
+        return not response.ok or _is_html_response(response.headers)
+
     def _fetch_with_newspaper(self, url: str) -> Optional[str]:
         """
         Fetch article using newspaper3k library.
@@ -147,9 +343,9 @@ class ArticleFetcher:
             logger.debug(f"Newspaper extraction failed for {url}: {e}")
             return None
 
-    def _fetch_with_beautifulsoup(self, url: str) -> Optional[str]:
+    def _fetch_with_lxml(self, url: str) -> Optional[str]:
         """
-        Fetch article using BeautifulSoup as fallback.
+        Fetch article using lxml as fallback.
 
         Args:
             url: Article URL
@@ -158,58 +354,200 @@ class ArticleFetcher:
             Article text or None
         """
         try:
-            # Fetch HTML
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Remove script and style elements
-            for script in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                script.decompose()
-
-            # Try to find article content
-            # Common article container tags/classes
-            article_selectors = [
-                {'name': 'article'},
-                {'class_': lambda x: x and 'article' in str(x).lower()},
-                {'class_': lambda x: x and 'content' in str(x).lower()},
-                {'class_': lambda x: x and 'post' in str(x).lower()},
-                {'id': lambda x: x and 'content' in str(x).lower()},
-            ]
-
-            article_text = None
-            for selector in article_selectors:
-                container = soup.find(**selector)
-                if container:
-                    # Get text from paragraphs
-                    paragraphs = container.find_all('p')
-                    if paragraphs:
-                        article_text = '\n\n'.join(p.get_text().strip() for p in paragraphs)
+            # Stream the body so an oversized page can't be pulled into memory
+            html = bytearray()
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                if not _is_html_response(response.headers):
+                    logger.debug(f"Skipping non-HTML response: {url}")
+                    return None
+                for chunk in response.iter_content(chunk_size=65536):
+                    html.extend(chunk)
+                    if len(html) >= MAX_HTML_BYTES:
+                        logger.debug(f"Truncating page at {MAX_HTML_BYTES} bytes: {url}")
                         break
 
-            # Fallback: get all paragraphs
-            if not article_text or len(article_text) < 100:
-                paragraphs = soup.find_all('p')
-                article_text = '\n\n'.join(p.get_text().strip() for p in paragraphs)
-
-            # Validate we got content
-            if article_text and len(article_text) > 100:
-                return article_text
-
-            return None
+            return self._extract_with_lxml(bytes(html[:MAX_HTML_BYTES]))
 
         except requests.exceptions.RequestException as e:
             logger.debug(f"HTTP error fetching {url}: {e}")
             return None
         except Exception as e:
-            logger.debug(f"BeautifulSoup extraction failed for {url}: {e}")
+            logger.debug(f"lxml extraction failed for {url}: {e}")
+            return None
+
+    def _extract_with_lxml(self, html: bytes) -> Optional[str]:
+        """
+        Extract article text from HTML with lxml.
+
+        Args:
+            html: Page HTML
+
+        Returns:
+            Article text or None
+        """
+        # Parse HTML; most pages are UTF-8, and the incremental decoder
+        # tolerates a character cut off by the download size cap
+        try:
+            tree = lxml.html.document_fromstring(
+                codecs.getincrementaldecoder('utf-8')().decode(html)
+            )
+        except (UnicodeDecodeError, ValueError):
+            # Not UTF-8, or an XML encoding declaration; let lxml pick the
+            # encoding from the document
+            tree = lxml.html.document_fromstring(html)
+
+        # Remove script and style elements
+        for element in tree.xpath(_BOILERPLATE_XPATH):
+            element.drop_tree()
+
+        # Try to find article content in common article containers
+        article_text = None
+        for xpath in _ARTICLE_XPATHS:
+            containers = xpath(tree)
+            if containers:
+                # Get text from paragraphs
+                paragraphs = containers[0].findall('.//p')
+                if paragraphs:
+                    article_text = '\n\n'.join(p.text_content().strip() for p in paragraphs)
+                    break
+
+        # Fallback: get all paragraphs
+        if not article_text or len(article_text) < 100:
+            paragraphs = tree.findall('.//p')
+            article_text = '\n\n'.join(p.text_content().strip() for p in paragraphs)
+
+        # Validate we got content
+        if article_text and len(article_text) > 100:
+            return article_text
+
+        return None
+
+    def _parse_html(self, html: bytes, url: str) -> Optional[str]:
+        """
+        Extract article text from already downloaded HTML.
+
+        Tries newspaper3k first, then lxml, like fetch_article.
+
+        Args:
+            html: Page HTML
+            url: URL the page was fetched from
+
+        Returns:
+            Article text or None
+        """
+        try:
+            article = Article(url)
+            article.download(input_html=html)
+            article.parse()
+            if article.text and len(article.text) > 100:
+                return article.text
+        except Exception as e:
+            logger.debug(f"Newspaper extraction failed for {url}: {e}")
+
+        try:
+            return self._extract_with_lxml(html)
+        except Exception as e:
+            logger.debug(f"lxml extraction failed for {url}: {e}")
             return None
 
+    async def _afetch_one(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        url: str
+    ) -> Optional[str]:
+        """
+        Fetch one article on a shared client, parsing it off the event loop.
+
+        Args:
+            client: HTTP client
+            semaphore: Bounds concurrent downloads
+            url: Article URL
+
+        Returns:
+            Article text or None
+        """
+        if _NON_ARTICLE_PATH_RE.search(urlsplit(url).path):
+            logger.debug(f"Skipping non-article URL: {url}")
+            return None
+
+        async with semaphore:
+            try:
+                html = bytearray()
+                async with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    # Headers arrive before the body; drop files and huge
+                    # pages without downloading them
+                    if not _is_html_response(response.headers):
+                        logger.debug(f"Skipping non-HTML response: {url}")
+                        return None
+                    async for chunk in response.aiter_bytes(65536):
+                        html.extend(chunk)
+                        if len(html) >= MAX_HTML_BYTES:
+                            logger.debug(f"Truncating page at {MAX_HTML_BYTES} bytes: {url}")
+                            break
+            except httpx.HTTPError as e:
+                logger.debug(f"HTTP error fetching {url}: {e}")
+                return None
+
+        # Parsing is CPU-bound and caching does blocking I/O; keep both
+        # off the event loop
+        return await asyncio.to_thread(self._parse_and_cache, bytes(html[:MAX_HTML_BYTES]), url)
+
+    def _parse_and_cache(self, html: bytes, url: str) -> Optional[str]:
+        """
+        Extract article text from downloaded HTML and cache it.
+
+        Args:
+            html: Page HTML
+            url: URL the page was fetched from
+
+        Returns:
+            Article text or None
+        """
+        content = self._parse_html(html, url)
+        if content and self.use_cache:
+            _article_cache.set(url, content)
+        return content
+
+    async def afetch_multiple(self, urls: list[str], concurrency: int = 16) -> Dict[str, str]:
+        """
+        Fetch multiple articles concurrently.
+
+        Each page is downloaded once and handed to the same extractors as
+        fetch_article, so wall time is roughly that of the slowest page
+        rather than the sum of all of them.
+
+        Args:
+            urls: List of URLs to fetch
+            concurrency: Maximum downloads in flight
+
+        Returns:
+            Dict mapping URLs to article content (only successful fetches)
+        """
+        # Look up every URL in one cache round trip; only misses are fetched
+        cached = {}
+        if self.use_cache:
+            cached = await asyncio.to_thread(_article_cache.get_many, urls)
+        to_fetch = [url for url in dict.fromkeys(urls) if url not in cached]
+
+        semaphore = asyncio.Semaphore(concurrency)
+        async with httpx.AsyncClient(
+            headers=_REQUEST_HEADERS,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=concurrency)
+        ) as client:
+            contents = await asyncio.gather(
+                *(self._afetch_one(client, semaphore, url) for url in to_fetch)
+            )
+
+        fetched = {url: content for url, content in zip(to_fetch, contents) if content}
+        results = {**cached, **fetched}
+        logger.info(f"Successfully fetched {len(results)}/{len(urls)} articles")
+        return results
+
     def fetch_multiple(self, urls: list[str], max_failures: int = 3) -> Dict[str, str]:
         """
         Fetch multiple articles.
@@ -255,8 +593,8 @@ def fetch_article_content(url: str, use_cache: bool = True) -> Optional[str]:
     Returns:
         Article text or None
     """
-    fetcher = ArticleFetcher(use_cache=use_cache)
-    return fetcher.fetch_article(url)
+    with ArticleFetcher(use_cache=use_cache) as fetcher:
+        return fetcher.fetch_article(url)
 
 
 def clear_article_cache():
@@ -1,8 +1,23 @@
 """Text chunking utilities."""
 import re
+from collections import Counter
 from typing import List, Tuple
 from dataclasses import dataclass
 
+# Patterns compiled once at import
+_WHITESPACE_RE = re.compile(r'\s+')
+_PUNCTUATION_RE = re.compile(r'\s*([.,!?;:])\s*')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Common stop words left out of search keywords
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
+    'those', 'it', 'its', 'they', 'them', 'their'
+})
+
 
 @dataclass
 class TextChunk:
@@ -48,10 +63,10 @@ class TextChunker:
         text = text.lower()
 
         # Replace multiple spaces with single space
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
 
         # Normalize punctuation spacing
-        text = re.sub(r'\s*([.,!?;:])\s*', r'\1 ', text)
+        text = _PUNCTUATION_RE.sub(r'\1 ', text)
 
         # Remove leading/trailing whitespace
         text = text.strip()
@@ -87,23 +102,34 @@ class TextChunker:
                 )
             ]
 
+        # Character offset of each word in the single-spaced text, computed
+        # once so each chunk's position is a lookup rather than a re-join
+        word_starts = [0]
+        offset = 0
+        for word in words:
+            offset += len(word) + 1
+            word_starts.append(offset)
+
         chunks = []
         chunk_index = 0
         start_word_idx = 0
+        stride = self.max_words - self.overlap_words
 
         while start_word_idx < len(words):
             # Calculate end word index
             end_word_idx = min(start_word_idx + self.max_words, len(words))
 
-            # Extract chunk words
-            chunk_words = words[start_word_idx:end_word_idx]
-            chunk_text = ' '.join(chunk_words)
-
             # Calculate character positions (approximate)
-            start_char = len(' '.join(words[:start_word_idx]))
-            if start_word_idx > 0:
-                start_char += 1  # Account for space
-            end_char = start_char + len(chunk_text)
+            start_char = word_starts[start_word_idx]
+            end_char = word_starts[end_word_idx] - 1
+
+            # Normalized text is single-spaced, so a slice equals the joined
+            # words without rebuilding the string word by word
+            if normalize:
+                chunk_text = text[start_char:end_char]
+            else:
+                chunk_text = ' '.join(words[start_word_idx:end_word_idx])
+                end_char = start_char + len(chunk_text)
 
             chunks.append(
                 TextChunk(
@@ -111,7 +137,7 @@ class TextChunker:
                     start_index=start_char,
                     end_index=end_char,
                     chunk_index=chunk_index,
-                    word_count=len(chunk_words)
+                    word_count=end_word_idx - start_word_idx
                 )
             )
 
@@ -121,7 +147,7 @@ class TextChunker:
             if end_word_idx >= len(words):
                 break
 
-            start_word_idx += (self.max_words - self.overlap_words)
+            start_word_idx += stride
 
         return chunks
 
@@ -153,24 +179,9 @@ def extract_keywords(text: str, top_k: int = 10) -> List[str]:
         List of keywords
     """
     # Simple keyword extraction (TF-IDF would be better)
-    # Remove common stop words
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-        'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these',
-        'those', 'it', 'its', 'they', 'them', 'their'
-    }
-
-    # Tokenize and filter
-    words = re.findall(r'\b\w+\b', text.lower())
-    words = [w for w in words if len(w) > 3 and w not in stop_words]
-
-    # Count frequencies
-    word_freq = {}
-    for word in words:
-        word_freq[word] = word_freq.get(word, 0) + 1
-
-    # Sort by frequency and return top-k
-    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-    return [word for word, _ in sorted_words[:top_k]]
+    # Tokenize and filter out stop words
+    words = _WORD_RE.findall(text.lower())
+
+    # Count frequencies and return the top-k (ties keep first-seen order)
+    word_freq = Counter(w for w in words if len(w) > 3 and w not in _STOP_WORDS)
+    return [word for word, _ in word_freq.most_common(top_k)]
@@ -1,10 +1,124 @@
 """Embedding generation using Sentence Transformers."""
+import json
+import threading
 import numpy as np
-from typing import List, Union
+import torch
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
 from sentence_transformers import SentenceTransformer
 from functools import lru_cache
 
 from app.config import settings
+from app.core.chunking import TextChunk
+
+
+def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetrically quantize embeddings to int8 with one scale per vector.
+
+    Args:
+        embeddings: Embeddings (1D or 2D array)
+
+    Returns:
+        Tuple of (int8 vectors, float32 scales) where
+        vectors * scales[..., None] approximates the input
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(embeddings).max(axis=-1) / 127.0
+    # An all-zero vector quantizes to zeros whatever the scale
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    quantized = np.clip(
+        np.rint(embeddings / scales[..., None]), -127, 127
+    ).astype(np.int8)
+    return quantized, scales
+
+
+class OnnxSentenceEncoder:
+    """
+    Runs an ONNX export of a sentence transformer with ONNX Runtime.
+
+    Mirrors the part of SentenceTransformer.encode that EmbeddingGenerator
+    uses (mean pooling plus optional L2 normalization), without PyTorch's
+    per-op dispatch. Export the model once with:
+
+        optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 \\
+            --task feature-extraction --optimize O3 ./data/onnx_minilm
+    """
+
+    # Sequence length used by all-MiniLM-L6-v2 when no config says otherwise
+    DEFAULT_MAX_SEQ_LENGTH = 256
+
+    def __init__(self, model_path: str):
+        """
+        Load the exported model and its tokenizer.
+
+        Args:
+            model_path: Directory holding model.onnx and the tokenizer files
+        """
+        # Optional dependency, only needed for the ONNX backend
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        path = Path(model_path)
+        self.tokenizer = AutoTokenizer.from_pretrained(path)
+        self.session = onnxruntime.InferenceSession(
+            str(path / "model.onnx"),
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+        self.max_seq_length = self.DEFAULT_MAX_SEQ_LENGTH
+        st_config = path / "sentence_bert_config.json"
+        if st_config.exists():
+            self.max_seq_length = json.loads(st_config.read_text()).get(
+                "max_seq_length", self.max_seq_length
+            )
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False
+    ) -> np.ndarray:
+        """
+        Generate embeddings for texts.
+
+        Args:
+            texts: Input texts
+            batch_size: Batch size for encoding
+            show_progress_bar: Accepted for compatibility; ignored
+            convert_to_numpy: Accepted for compatibility; always numpy
+            normalize_embeddings: Whether to L2-normalize embeddings
+
+        Returns:
+            Numpy array of embeddings
+        """
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding="longest",
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean-pool token embeddings over the non-padding positions
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            embeddings.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+
+        if not embeddings:
+            return np.empty((0, 0), dtype=np.float32)
+
+        result = np.concatenate(embeddings).astype(np.float32)
+        if normalize_embeddings:
+            result /= np.clip(np.linalg.norm(result, axis=1, keepdims=True), 1e-12, None)
+        return result
 
 
 class EmbeddingGenerator:
@@ -12,31 +126,43 @@ class EmbeddingGenerator:
 
     _instance = None
     _model = None
+    # Guards creation and model loading so concurrent first calls load once
+    _lock = threading.Lock()
 
     def __new__(cls):
         """Singleton pattern to avoid loading model multiple times."""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self):
         """Initialize the embedding model."""
         if self._model is None:
-            self._load_model()
+            with self._lock:
+                if self._model is None:
+                    self._load_model()
 
     def _load_model(self):
         """Load the sentence transformer model."""
         try:
-            self._model = SentenceTransformer(settings.embedding_model)
-            print(f"Loaded embedding model: {settings.embedding_model}")
+            if settings.embedding_backend == "onnx":
+                self._model = OnnxSentenceEncoder(settings.embedding_onnx_path)
+                print(f"Loaded ONNX embedding model: {settings.embedding_onnx_path}")
+            else:
+                self._model = SentenceTransformer(settings.embedding_model)
+                print(f"Loaded embedding model: {settings.embedding_model}")
         except Exception as e:
             raise RuntimeError(f"Failed to load embedding model: {e}")
 
     @property
-    def model(self) -> SentenceTransformer:
+    def model(self) -> Union[SentenceTransformer, OnnxSentenceEncoder]:
         """Get the loaded model."""
         if self._model is None:
-            self._load_model()
+            with self._lock:
+                if self._model is None:
+                    self._load_model()
         return self._model
 
     @property
@@ -65,16 +191,69 @@ class EmbeddingGenerator:
         if isinstance(texts, str):
             texts = [texts]
 
-        # Generate embeddings
-        embeddings = self.model.encode(
-            texts,
+        # Generate embeddings; inference mode skips autograd bookkeeping
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                texts,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=normalize
+            )
+
+        return embeddings
+
+    def encode_chunks(
+        self,
+        chunks: Sequence[TextChunk],
+        batch_size: int = 64
+    ) -> np.ndarray:
+        """
+        Generate normalized embeddings for chunks in a single batched call.
+
+        Texts are ordered by length before encoding so each minibatch pads
+        to similar lengths; rows are returned in the order of `chunks`.
+
+        Args:
+            chunks: Chunks to encode
+            batch_size: Batch size for encoding
+
+        Returns:
+            Numpy array of embeddings, one row per chunk
+        """
+        texts = [chunk.text for chunk in chunks]
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+        embeddings = self.encode(
+            [texts[i] for i in order],
             batch_size=batch_size,
-            show_progress_bar=False,
-            convert_to_numpy=True,
-            normalize_embeddings=normalize
+            normalize=True
         )
 
-        return embeddings
+        # Scatter rows back to the callers' order
+        out = np.empty_like(embeddings)
+        out[order] = embeddings
+        return out
+
+    def encode_int8(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: int = 32
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate normalized embeddings quantized to int8.
+
+        Takes a quarter of the memory of float32 embeddings; pass the
+        scales to batch_similarity along with the vectors.
+
+        Args:
+            texts: Single text or list of texts
+            batch_size: Batch size for encoding
+
+        Returns:
+            Tuple of (int8 embeddings, float32 per-vector scales)
+        """
+        return quantize_int8(self.encode(texts, batch_size=batch_size, normalize=True))
 
     def encode_single(self, text: str, normalize: bool = True) -> np.ndarray:
         """
@@ -108,21 +287,41 @@ class EmbeddingGenerator:
     def batch_similarity(
         self,
         query_embedding: np.ndarray,
-        candidate_embeddings: np.ndarray
+        candidate_embeddings: np.ndarray,
+        candidate_scales: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Calculate similarity between query and multiple candidates.
 
         Args:
             query_embedding: Query embedding (1D array)
-            candidate_embeddings: Candidate embeddings (2D array)
+            candidate_embeddings: Candidate embeddings (2D array), float or
+                int8 as returned by encode_int8
+            candidate_scales: Per-vector scales, required for int8 candidates
 
         Returns:
             Array of similarity scores
         """
-        # Matrix multiplication for batch cosine similarity
-        similarities = np.dot(candidate_embeddings, query_embedding)
-        return np.clip(similarities, 0.0, 1.0)
+        if candidate_embeddings.dtype == np.int8:
+            if candidate_scales is None:
+                raise ValueError("candidate_scales are required for int8 embeddings")
+
+            # Quantize the query too and accumulate the integer dot products
+            # in int32 (int8 products overflow int16 over 384 dimensions)
+            query_q, query_scale = quantize_int8(query_embedding)
+            dots = candidate_embeddings.astype(np.int32) @ query_q.astype(np.int32)
+            similarities = dots * candidate_scales * query_scale
+            return np.clip(similarities, 0.0, 1.0).astype(np.float32)
+
+        # A C-contiguous float32 matrix lets numpy hand the product to a
+        # single BLAS sgemv call; both conversions are no-ops for arrays
+        # coming from encode
+        candidate_embeddings = np.ascontiguousarray(candidate_embeddings, dtype=np.float32)
+        query_embedding = np.ascontiguousarray(query_embedding, dtype=np.float32)
+
+        # Matrix multiplication for batch cosine similarity, clipped in place
+        similarities = candidate_embeddings @ query_embedding
+        return np.clip(similarities, 0.0, 1.0, out=similarities)
 
 
 # Global instance
@@ -0,0 +1,165 @@
+"""Monthly check quota counters kept in Redis.
+
+The API reserves quota with a single atomic Redis script instead of a
+database UPDATE per submission. Counters are folded back into
+``organizations.current_month_checks`` by a periodic Celery task.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+from redis.exceptions import RedisError
+
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+QUOTA_KEY_PREFIX = "quota"
+
+# KEYS[1] = counter key
+# ARGV[1] = monthly limit, ARGV[2] = checks used according to the database,
+# ARGV[3] = unix time the counter expires (start of next month)
+# The counter is raised to the database count if that is higher (a new
+# counter, or checks reserved in the database while Redis was down).
+# Returns the new count, or -1 if the limit is already reached.
+_RESERVE_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '-1')
+local used = tonumber(ARGV[2])
+if current < used then
+    current = used
+    redis.call('SET', KEYS[1], current)
+    redis.call('EXPIREAT', KEYS[1], ARGV[3])
+end
+if current >= tonumber(ARGV[1]) then
+    return -1
+end
+return redis.call('INCR', KEYS[1])
+"""
+
+# KEYS[1] = counter key
+# A missing counter (evicted, or its period ended) is left alone; DECR
+# would recreate it as -1 without an expiry.
+_RELEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+
+def current_period(now: Optional[datetime] = None) -> str:
+    """
+    Get the quota period identifier (YYYYMM) for a point in time.
+
+    Args:
+        now: Time to get the period for (defaults to current UTC time)
+
+    Returns:
+        Period identifier
+    """
+    now = now or datetime.utcnow()
+    return f"{now.year:04d}{now.month:02d}"
+
+
+def period_end(now: Optional[datetime] = None) -> datetime:
+    """
+    Get the start of the next quota period.
+
+    Args:
+        now: Time within the current period (defaults to current UTC time)
+
+    Returns:
+        Naive UTC datetime of the first instant of next month
+    """
+    now = now or datetime.utcnow()
+    if now.month == 12:
+        return datetime(now.year + 1, 1, 1)
+    return datetime(now.year, now.month + 1, 1)
+
+
+def quota_key(organization_id: UUID, period: Optional[str] = None) -> str:
+    """Build the Redis key for an organization's monthly counter."""
+    return f"{QUOTA_KEY_PREFIX}:{organization_id}:{period or current_period()}"
+
+
+async def try_reserve(
+    organization_id: UUID,
+    limit: int,
+    used: int,
+    now: Optional[datetime] = None
+) -> Optional[bool]:
+    """
+    Reserve one check from an organization's monthly quota.
+
+    The counter is seeded from the database value the first time it is
+    seen in a period (and raised to it if the database is ahead) and
+    expires when the period ends.
+
+    Args:
+        organization_id: Organization ID
+        limit: Monthly check limit
+        used: Checks already used according to the database
+        now: Time of the reservation, selecting its period (defaults to
+            current UTC time)
+
+    Returns:
+        True if reserved, False if the quota is exhausted, or None if Redis
+        is unavailable and the caller should reserve in the database
+    """
+    now = now or datetime.utcnow()
+    expire_at = int((period_end(now) - datetime(1970, 1, 1)).total_seconds())
+
+    try:
+        result = await get_redis().eval(
+            _RESERVE_SCRIPT,
+            1,
+            quota_key(organization_id, current_period(now)),
+            limit,
+            used,
+            expire_at
+        )
+    except RedisError as e:
+        logger.warning("Quota counter unavailable, falling back to database: %s", e)
+        return None
+
+    return int(result) >= 0
+
+
+async def release_reservation(organization_id: UUID, period: str) -> None:
+    """
+    Return a reserved check to the quota (e.g. when creating the check failed).
+
+    Args:
+        organization_id: Organization ID
+        period: Quota period the check was reserved in
+    """
+    try:
+        await get_redis().eval(_RELEASE_SCRIPT, 1, quota_key(organization_id, period))
+    except RedisError as e:
+        logger.warning("Failed to release quota reservation: %s", e)
+
+
+async def read_counters(client, period: Optional[str] = None) -> Dict[UUID, int]:
+    """
+    Read all organizations' counters for a period.
+
+    Args:
+        client: Redis client to read with
+        period: Quota period (defaults to the current one)
+
+    Returns:
+        Mapping of organization ID to checks used
+    """
+    period = period or current_period()
+    keys = [key async for key in client.scan_iter(match=f"{QUOTA_KEY_PREFIX}:*:{period}", count=500)]
+    if not keys:
+        return {}
+
+    values = await client.mget(keys)
+    counters = {}
+    for key, value in zip(keys, values):
+        if value is None:
+            continue
+        organization_id = key.split(":")[1]
+        counters[UUID(organization_id)] = int(value)
+    return counters
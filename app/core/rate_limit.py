@@ -0,0 +1,98 @@
+"""Per-API-key rate limiting and usage counters kept in Redis.
+
+Each authenticated request costs one Redis round trip instead of an
+UPDATE on ``api_keys``. Usage (request count, last use) is buffered in
+Redis and written back to the database by a periodic Celery task.
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+from redis.exceptions import RedisError
+
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "rl"
+USAGE_KEY_PREFIX = "api_key_usage"
+
+# Fixed rate-limit window in seconds
+_WINDOW_SECONDS = 60
+
+# KEYS[1] = window counter key, KEYS[2] = usage hash key
+# ARGV[1] = window length in seconds, ARGV[2] = current unix time
+# Returns the number of requests made in the current window.
+_HIT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+redis.call('HINCRBY', KEYS[2], 'requests', 1)
+redis.call('HSET', KEYS[2], 'last_used', ARGV[2])
+return count
+"""
+
+
+def usage_key(api_key_id: UUID) -> str:
+    """Build the Redis key buffering an API key's usage."""
+    return f"{USAGE_KEY_PREFIX}:{api_key_id}"
+
+
+async def record_request(api_key_id: UUID) -> Optional[int]:
+    """
+    Count a request against an API key's rate-limit window and usage.
+
+    Args:
+        api_key_id: API key ID
+
+    Returns:
+        Requests made in the current window (including this one), or None
+        if Redis is unavailable and the caller should record usage in the
+        database
+    """
+    now = time.time()
+    window = int(now // _WINDOW_SECONDS)
+
+    try:
+        count = await get_redis().eval(
+            _HIT_SCRIPT,
+            2,
+            f"{RATE_LIMIT_KEY_PREFIX}:{api_key_id}:{window}",
+            usage_key(api_key_id),
+            _WINDOW_SECONDS,
+            now
+        )
+    except RedisError as e:
+        logger.warning("Rate limiter unavailable, falling back to database: %s", e)
+        return None
+
+    return int(count)
+
+
+async def drain_usage(client) -> Dict[UUID, Tuple[int, datetime]]:
+    """
+    Read and clear every buffered API key usage counter.
+
+    Each hash is read and deleted in one MULTI/EXEC, so requests counted
+    concurrently land in a fresh hash and are picked up by the next drain.
+
+    Args:
+        client: Redis client to read with
+
+    Returns:
+        Mapping of API key ID to (requests, last used as naive UTC datetime)
+    """
+    usage = {}
+    async for key in client.scan_iter(match=f"{USAGE_KEY_PREFIX}:*", count=500):
+        async with client.pipeline(transaction=True) as pipe:
+            fields, _ = await pipe.hgetall(key).delete(key).execute()
+        if not fields:
+            continue
+        api_key_id = UUID(key.split(":", 1)[1])
+        usage[api_key_id] = (
+            int(fields.get("requests", 0)),
+            datetime.utcfromtimestamp(float(fields["last_used"]))
+        )
+    return usage
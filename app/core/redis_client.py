@@ -0,0 +1,43 @@
+"""Shared Redis client for API-side counters and caches.
+
+Redis is treated as an accelerator, never a source of truth: callers are
+expected to fall back to the database when a Redis command fails.
+"""
+import logging
+from typing import Optional
+import redis.asyncio as redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Get the process-wide Redis client.
+
+    The client keeps its own connection pool, so it is created once and
+    shared by every request handled by this worker.
+
+    Returns:
+        Redis client
+    """
+    global _client
+    if _client is None:
+        _client = redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -77,8 +77,7 @@ class SimilarityEngine:
         chunks = self.chunker.chunk_text(text, normalize=True)
 
         # Generate embeddings for all chunks
-        chunk_texts = [chunk.text for chunk in chunks]
-        embeddings = self.embedder.encode(chunk_texts, normalize=True)
+        embeddings = self.embedder.encode_chunks(chunks)
 
         return chunks, embeddings
 
@@ -150,26 +149,40 @@ class SimilarityEngine:
         Returns:
             List of aggregated matches per source
         """
-        # Group by source_id
-        source_groups: Dict[str, List[SimilarityMatch]] = {}
-        for match in matches:
-            if match.source_id not in source_groups:
-                source_groups[match.source_id] = []
-            source_groups[match.source_id].append(match)
+        if not matches:
+            return []
 
-        # Aggregate each source
+        # Group by source_id and compute per-source statistics in one
+        # vectorized pass
+        source_ids = np.array([m.source_id for m in matches])
+        scores = np.fromiter(
+            (m.similarity_score for m in matches), dtype=np.float64, count=len(matches)
+        )
+        _, first_seen, group = np.unique(source_ids, return_index=True, return_inverse=True)
+        counts = np.bincount(group)
+        sums = np.bincount(group, weights=scores)
+        maxs = np.full(len(counts), -np.inf)
+        np.maximum.at(maxs, group, scores)
+
+        # Match positions per source (input order), and each source's best
+        # match (the first one with the top score)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        members = np.split(np.argsort(group, kind="stable"), starts[1:])
+        best = np.lexsort((-scores, group))[starts]
+
+        # Aggregate each source, in order of first appearance
         aggregated = []
-        for source_id, source_matches in source_groups.items():
-            scores = [m.similarity_score for m in source_matches]
+        for g in np.argsort(first_seen):
+            source_matches = [matches[i] for i in members[g]]
 
             # Get source metadata from first match
             first_match = source_matches[0]
             source_metadata = first_match.source_metadata or {}
 
             # Calculate aggregated metrics
-            max_score = max(scores)
-            avg_score = np.mean(scores)
-            match_count = len(source_matches)
+            max_score = float(maxs[g])
+            avg_score = float(sums[g] / counts[g])
+            match_count = int(counts[g])
 
             # Overall similarity for this source (weighted)
             overall_similarity = (max_score * 0.6 + avg_score * 0.4)
@@ -183,7 +196,7 @@ class SimilarityEngine:
                 risk_contribution = "low"
 
             # Generate snippet and explanation
-            snippet = self._generate_snippet(source_matches)
+            snippet = self._generate_snippet(matches[best[g]])
             explanation = self._generate_explanation(
                 source_matches,
                 overall_similarity,
@@ -199,7 +212,7 @@ class SimilarityEngine:
 
             aggregated.append(
                 AggregatedMatch(
-                    source_id=source_id,
+                    source_id=first_match.source_id,
                     source_type=first_match.source_type,
                     source_title=source_metadata.get("title"),
                     source_identifier=source_metadata.get("identifier"),
@@ -220,14 +233,8 @@ class SimilarityEngine:
 
         return aggregated
 
-    def _generate_snippet(self, matches: List[SimilarityMatch]) -> str:
+    def _generate_snippet(self, best_match: SimilarityMatch) -> str:
         """Generate a short snippet from the best match."""
-        if not matches:
-            return ""
-
-        # Get the match with highest similarity
-        best_match = max(matches, key=lambda m: m.similarity_score)
-
         # Truncate to max length
         snippet = best_match.source_chunk_text
         if len(snippet) > settings.snippet_max_length:
@@ -0,0 +1,83 @@
+"""Short-lived cache of authenticated users kept in Redis.
+
+Every JWT-authenticated request needs the user's row. Caching its public
+columns for a few seconds saves that SELECT on the hot path; writes to a
+user invalidate the entry, and the TTL bounds staleness for anything else.
+The password hash is never cached.
+"""
+import logging
+from typing import Any, Dict, Optional
+from uuid import UUID
+from pydantic import ValidationError as PydanticValidationError
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.redis_client import get_redis
+from app.models.user import User
+from app.schemas.user import UserResponse
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_KEY_PREFIX = "u"
+
+
+def user_cache_key(user_id: UUID) -> str:
+    """Build the Redis key caching a user's columns."""
+    return f"{USER_CACHE_KEY_PREFIX}:{user_id}"
+
+
+async def get_cached_user(user_id: UUID) -> Optional[Dict[str, Any]]:
+    """
+    Get a user's cached columns.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        User column values (without the password hash), or None on a miss
+        or if Redis is unavailable
+    """
+    try:
+        raw = await get_redis().get(user_cache_key(user_id))
+    except RedisError as e:
+        logger.warning("User cache unavailable, falling back to database: %s", e)
+        return None
+
+    if raw is None:
+        return None
+
+    try:
+        return UserResponse.model_validate_json(raw).model_dump()
+    except PydanticValidationError:
+        # Written by an incompatible release; treat as a miss
+        return None
+
+
+async def cache_user(user: User) -> None:
+    """
+    Cache a user's columns for settings.user_cache_ttl_seconds.
+
+    Args:
+        user: User loaded from the database
+    """
+    try:
+        await get_redis().set(
+            user_cache_key(user.id),
+            UserResponse.model_validate(user).model_dump_json(),
+            ex=settings.user_cache_ttl_seconds
+        )
+    except RedisError as e:
+        logger.warning("Failed to cache user: %s", e)
+
+
+async def invalidate_user(user_id: UUID) -> None:
+    """
+    Drop a user's cache entry after the user was changed or deleted.
+
+    Args:
+        user_id: User ID
+    """
+    try:
+        await get_redis().delete(user_cache_key(user_id))
+    except RedisError as e:
+        logger.warning("Failed to invalidate cached user: %s", e)
@@ -1,14 +1,33 @@
 """FAISS vector store for similarity search."""
+import hashlib
 import os
 import pickle
+import threading
 import numpy as np
 import faiss
+from cachetools import LRUCache
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
 
 from app.config import settings
 
+# Cosine stores up to this size also keep their vectors as a plain float32
+# matrix; batched searches over it are one BLAS matmul, which beats the
+# FAISS index's per-query scans
+EXACT_SEARCH_MAX_VECTORS = 20_000
+
+# Candidates fetched from an 8-bit index per result, then re-scored exactly
+RERANK_FACTOR = 4
+
+# HNSW graph parameters: links per node and candidate list sizes
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Unfiltered single-query results remembered per store, keyed by query and k
+SEARCH_CACHE_SIZE = 2048
+
 
 @dataclass
 class VectorMetadata:
@@ -31,7 +50,9 @@ class FAISSVectorStore:
         self,
         dimension: int,
         index_path: Optional[str] = None,
-        metric: str = "cosine"
+        metric: str = "cosine",
+        int8: Optional[bool] = None,
+        index_type: Optional[str] = None
     ):
         """
         Initialize FAISS vector store.
@@ -40,29 +61,118 @@ class FAISSVectorStore:
             dimension: Embedding dimension
             index_path: Path to save/load index
             metric: Distance metric (cosine or euclidean)
+            int8: Store cosine vectors as 8-bit scalars (defaults to
+                settings.vector_store_int8)
+            index_type: "flat" for exhaustive search or "hnsw" for an
+                approximate graph index whose query cost grows with log N
+                (defaults to settings.vector_store_index; cosine only)
+
+        An index loaded from disk keeps the type it was saved with.
         """
         self.dimension = dimension
         self.index_path = index_path or settings.vector_store_path
         self.metric = metric
+        self.int8 = settings.vector_store_int8 if int8 is None else int8
+        self.index_type = settings.vector_store_index if index_type is None else index_type
 
         # Create index directory
         Path(self.index_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize FAISS index
-        if metric == "cosine":
-            # Use Inner Product for cosine similarity (assuming normalized vectors)
-            self.index = faiss.IndexFlatIP(dimension)
-        else:
-            # Use L2 distance
-            self.index = faiss.IndexFlatL2(dimension)
+        self.index = self._create_index()
+        self._quantized = self._is_quantized(self.index)
 
         # Metadata storage (indexed by vector ID)
         self.metadata: Dict[int, VectorMetadata] = {}
         self.next_id = 0
 
+        # Raw vectors for exact search and the vector ID of each row (in
+        # ascending order); _vectors is None once the store outgrows
+        # EXACT_SEARCH_MAX_VECTORS (or for L2 stores)
+        self._vectors: Optional[np.ndarray] = None
+        self._vector_ids = np.empty(0, dtype=np.int64)
+        self._vector_count = 0
+        self._reset_vectors()
+
+        # Recent search results; emptied whenever the stored vectors change
+        self._search_cache: LRUCache = LRUCache(maxsize=SEARCH_CACHE_SIZE)
+        self._search_cache_lock = threading.Lock()
+        self._search_cache_generation = 0
+
         # Load existing index if available
         self._load()
 
+    def _create_index(self) -> faiss.Index:
+        """
+        Create an empty index for this store's metric and settings.
+
+        Returns:
+            Trained FAISS index
+        """
+        if self.metric != "cosine":
+            # Use L2 distance
+            return faiss.IndexIDMap2(faiss.IndexFlatL2(self.dimension))
+
+        # Use Inner Product for cosine similarity (assuming normalized vectors)
+        if self.index_type == "hnsw":
+            if self.int8:
+                index = faiss.IndexHNSWSQ(
+                    self.dimension,
+                    faiss.ScalarQuantizer.QT_8bit_uniform,
+                    HNSW_M,
+                    faiss.METRIC_INNER_PRODUCT
+                )
+            else:
+                index = faiss.IndexHNSWFlat(self.dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+        elif self.int8:
+            index = faiss.IndexScalarQuantizer(
+                self.dimension,
+                faiss.ScalarQuantizer.QT_8bit_uniform,
+                faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            index = faiss.IndexFlatIP(self.dimension)
+
+        if not index.is_trained:
+            # Vectors are L2-normalized before they are added, so every
+            # component lies in [-1, 1]; training on those bounds fixes the
+            # 8-bit quantizer range without needing sample data
+            bounds = np.array([[-1.0] * self.dimension, [1.0] * self.dimension], dtype=np.float32)
+            index.train(bounds)
+
+        # Address vectors by their store ID so they can be removed
+        return faiss.IndexIDMap2(index)
+
+    @staticmethod
+    def _wrap_with_ids(index: faiss.Index) -> faiss.IndexIDMap2:
+        """
+        Move an index saved before vectors carried IDs into an IndexIDMap2.
+
+        Such indexes held vector ID i at position i.
+
+        Args:
+            index: Index read from disk
+
+        Returns:
+            Equivalent index addressed by vector ID
+        """
+        vectors = index.reconstruct_n(0, index.ntotal)
+        empty = faiss.clone_index(index)
+        empty.reset()
+        wrapped = faiss.IndexIDMap2(empty)
+        if len(vectors):
+            wrapped.add_with_ids(vectors, np.arange(len(vectors), dtype=np.int64))
+        return wrapped
+
+    @staticmethod
+    def _is_quantized(index: faiss.Index) -> bool:
+        """Check whether an index stores 8-bit approximations of its vectors."""
+        if isinstance(index, faiss.IndexIDMap2):
+            index = faiss.downcast_index(index.index)
+        return isinstance(index, (faiss.IndexScalarQuantizer, faiss.IndexHNSWSQ))
+
     def add_vectors(
         self,
         embeddings: np.ndarray,
@@ -90,7 +200,9 @@ class FAISSVectorStore:
 
         # Add to FAISS index
         start_id = self.next_id
-        self.index.add(embeddings)
+        ids = np.arange(start_id, start_id + len(embeddings), dtype=np.int64)
+        self.index.add_with_ids(embeddings, ids)
+        self._append_vectors(embeddings, ids)
 
         # Store metadata
         vector_ids = []
@@ -100,9 +212,139 @@ class FAISSVectorStore:
             vector_ids.append(vector_id)
 
         self.next_id += len(embeddings)
+        self._clear_search_cache()
 
         return vector_ids
 
+    def _clear_search_cache(self) -> None:
+        """Forget cached search results after the stored vectors changed."""
+        with self._search_cache_lock:
+            self._search_cache.clear()
+            self._search_cache_generation += 1
+
+    def _reset_vectors(self) -> None:
+        """Empty the exact-search matrix (cosine stores only)."""
+        if self.metric == "cosine":
+            self._vectors = np.empty((0, self.dimension), dtype=np.float32)
+            self._vector_ids = np.empty(0, dtype=np.int64)
+            self._vector_count = 0
+
+    def _append_vectors(self, embeddings: np.ndarray, ids: np.ndarray) -> None:
+        """
+        Append normalized vectors to the exact-search matrix.
+
+        The matrix grows by doubling so repeated adds stay amortized O(1)
+        per vector, and is dropped once the store is too large for
+        brute force to beat the FAISS index.
+
+        Args:
+            embeddings: Vectors just added to the index
+            ids: Their vector IDs
+        """
+        if self._vectors is None:
+            return
+
+        start = self._vector_count
+        count = start + len(embeddings)
+        if count > EXACT_SEARCH_MAX_VECTORS:
+            self._vectors = None
+            return
+
+        if count > len(self._vectors):
+            capacity = max(count, 2 * len(self._vectors))
+            grown = np.empty((capacity, self.dimension), dtype=np.float32)
+            grown[:start] = self._vectors[:start]
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_ids[:start] = self._vector_ids[:start]
+            self._vectors, self._vector_ids = grown, grown_ids
+
+        self._vectors[start:count] = embeddings
+        self._vector_ids[start:count] = ids
+        self._vector_count = count
+
+    def _remove_vectors(self, ids: np.ndarray) -> None:
+        """
+        Drop vectors from the exact-search matrix, keeping row order.
+
+        Args:
+            ids: Vector IDs to drop
+        """
+        if self._vectors is None:
+            return
+
+        count = self._vector_count
+        keep = ~np.isin(self._vector_ids[:count], ids)
+        kept = int(keep.sum())
+        self._vectors[:kept] = self._vectors[:count][keep]
+        self._vector_ids[:kept] = self._vector_ids[:count][keep]
+        self._vector_count = kept
+
+    def _search_index(
+        self,
+        query_embeddings: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest vectors for each query.
+
+        Batches against small cosine stores are searched exactly with one
+        matrix product and a partial sort. Single queries and larger
+        stores go through the FAISS index, which is as fast or faster there;
+        for 8-bit indexes small enough to keep float32 vectors, a single
+        query's shortlist is re-ranked with exact scores.
+
+        Args:
+            query_embeddings: Prepared queries (N x dimension, float32)
+            k: Number of results per query
+
+        Returns:
+            Tuple of (scores, vector IDs), each N x k, best first, in the
+            same layout as faiss.Index.search
+        """
+        if self._vectors is None:
+            distances, ids = self.index.search(query_embeddings, k)
+            if self._quantized:
+                # Inner products of 8-bit codes can overshoot [-1, 1]
+                np.clip(distances, -1.0, 1.0, out=distances)
+            return distances, ids
+
+        count = self._vector_count
+        if count == 0 or k == 0:
+            empty = np.empty((len(query_embeddings), 0))
+            return empty.astype(np.float32), empty.astype(np.int64)
+
+        if len(query_embeddings) == 1:
+            # The index may still hold removed vectors, so k is bounded by
+            # its size rather than the live count
+            if not self._quantized:
+                return self.index.search(query_embeddings, min(k, self.index.ntotal))
+
+            # Shortlist from the 8-bit index, then re-score the shortlist
+            # with the float32 vectors
+            _, candidates = self.index.search(
+                query_embeddings, min(k * RERANK_FACTOR, self.index.ntotal)
+            )
+            vector_ids = self._vector_ids[:count]
+            rows = np.searchsorted(vector_ids, candidates[0])
+            # Skip padding (-1) and vectors the index still holds but the
+            # store removed
+            rows = rows[(rows < count) & (vector_ids[np.minimum(rows, count - 1)] == candidates[0])]
+            exact_scores = self._vectors[rows] @ query_embeddings[0]
+            order = np.argsort(-exact_scores)[:k]
+            return exact_scores[order][None, :], vector_ids[rows[order]][None, :]
+
+        k = min(k, count)
+        scores = query_embeddings @ self._vectors[:count].T
+
+        # Select the top k per row without sorting all scores, then order them
+        top = np.argpartition(scores, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return (
+            np.take_along_axis(top_scores, order, axis=1),
+            self._vector_ids[np.take_along_axis(top, order, axis=1)]
+        )
+
     def search(
         self,
         query_embedding: np.ndarray,
@@ -133,10 +375,23 @@ class FAISSVectorStore:
         if self.metric == "cosine":
             faiss.normalize_L2(query_embedding)
 
+        # Identical queries (re-checked submissions, repeated phrases) are
+        # answered from the cache; filtered searches are not cached
+        cache_key = None
+        if filter_fn is None:
+            cache_key = (hashlib.blake2b(query_embedding.tobytes(), digest_size=16).digest(), k)
+            with self._search_cache_lock:
+                cached = self._search_cache.get(cache_key)
+                generation = self._search_cache_generation
+            if cached is not None:
+                return list(cached)
+
         # Search
-        # Request more results to account for filtering
-        search_k = min(k * 3, self.index.ntotal) if filter_fn else min(k, self.index.ntotal)
-        distances, indices = self.index.search(query_embedding, int(search_k))
+        # Request more results to account for filtering, and for removed
+        # vectors an HNSW index still holds
+        hidden = self.index.ntotal - len(self.metadata)
+        search_k = min((k * 3 if filter_fn else k) + hidden, self.index.ntotal)
+        distances, indices = self._search_index(query_embedding, int(search_k))
 
         # Process results
         results = []
@@ -166,12 +421,19 @@ class FAISSVectorStore:
             if len(results) >= k:
                 break
 
+        if cache_key is not None:
+            with self._search_cache_lock:
+                # Don't cache a result computed while the vectors changed
+                if generation == self._search_cache_generation:
+                    self._search_cache[cache_key] = tuple(results)
+
         return results
 
     def batch_search(
         self,
         query_embeddings: np.ndarray,
-        k: int = 10
+        k: int = 10,
+        filter_fn: Optional[callable] = None
     ) -> List[List[Tuple[VectorMetadata, float]]]:
         """
         Search for multiple queries.
@@ -179,10 +441,15 @@ class FAISSVectorStore:
         Args:
             query_embeddings: Query embeddings (N x dimension)
             k: Number of results per query
+            filter_fn: Optional filter function for metadata
 
         Returns:
             List of result lists
         """
+        # Return empty results if index is empty
+        if self.index.ntotal == 0:
+            return [[] for _ in range(len(query_embeddings))]
+
         # Ensure float32
         query_embeddings = query_embeddings.astype(np.float32)
 
@@ -191,7 +458,11 @@ class FAISSVectorStore:
             faiss.normalize_L2(query_embeddings)
 
         # Search
-        distances, indices = self.index.search(query_embeddings, k)
+        # Request more results to account for filtering, and for removed
+        # vectors an HNSW index still holds
+        hidden = self.index.ntotal - len(self.metadata)
+        search_k = min((k * 3 if filter_fn else k) + hidden, self.index.ntotal)
+        distances, indices = self._search_index(query_embeddings, int(search_k))
 
         # Process results for each query
         all_results = []
@@ -205,6 +476,10 @@ class FAISSVectorStore:
                 if meta is None:
                     continue
 
+                # Apply filter if provided
+                if filter_fn and not filter_fn(meta):
+                    continue
+
                 # Convert distance to similarity
                 if self.metric == "cosine":
                     similarity = float(dist)
@@ -213,6 +488,10 @@ class FAISSVectorStore:
 
                 results.append((meta, similarity))
 
+                # Stop if we have enough results
+                if len(results) >= k:
+                    break
+
             all_results.append(results)
 
         return all_results
@@ -221,15 +500,12 @@ class FAISSVectorStore:
         """
         Remove all vectors for a specific source.
 
-        Note: FAISS doesn't support efficient deletion, so we rebuild the index.
-
         Args:
             source_id: Source ID to remove
 
         Returns:
             Number of vectors removed
         """
-        # Find vectors to keep
         ids_to_remove = [
             vid for vid, meta in self.metadata.items()
             if meta.source_id == source_id
@@ -238,35 +514,30 @@ class FAISSVectorStore:
         if not ids_to_remove:
             return 0
 
-        # Rebuild index without removed vectors
-        ids_to_keep = [
-            vid for vid in self.metadata.keys()
-            if vid not in ids_to_remove
-        ]
-
-        if not ids_to_keep:
-            # All vectors removed, reset index
-            self.index.reset()
-            self.metadata.clear()
-            self.next_id = 0
-            return len(ids_to_remove)
-
-        # Extract vectors to keep
-        vectors_to_keep = []
-        metadata_to_keep = []
-
-        for vid in ids_to_keep:
-            # Note: This is inefficient but FAISS doesn't provide direct access
-            # In production, consider using FAISS with IDMap or IndexIVF
+        ids = np.array(ids_to_remove, dtype=np.int64)
+        try:
+            self.index.remove_ids(ids)
+        except RuntimeError:
+            # HNSW graphs can't delete; their vectors stay in the index but
+            # are skipped once their metadata is gone
             pass
+        self._remove_vectors(ids)
 
-        # For MVP, just remove from metadata
-        # (vectors stay in FAISS but won't be returned)
         for vid in ids_to_remove:
             del self.metadata[vid]
+        self._clear_search_cache()
+
+        if not self.metadata:
+            # All vectors removed, reset index
+            self.clear()
 
         return len(ids_to_remove)
 
+    def count(self) -> int:
+        """Get the number of vectors in the store."""
+        # An HNSW index still holds vectors removed from the store
+        return len(self.metadata)
+
     def get_stats(self) -> Dict:
         """Get store statistics."""
         return {
@@ -278,10 +549,21 @@ class FAISSVectorStore:
 
     def save(self) -> None:
         """Save index and metadata to disk."""
-        # Save FAISS index
+        Path(self.index_path).mkdir(parents=True, exist_ok=True)
+
+        # Save FAISS index (an 8-bit index is written with its trained quantizer)
         index_file = f"{self.index_path}/faiss.index"
         faiss.write_index(self.index, index_file)
 
+        # Save the float32 exact-search matrix; an 8-bit index can only
+        # give back approximations of its vectors
+        vectors_file = f"{self.index_path}/vectors.npz"
+        if self._vectors is not None:
+            count = self._vector_count
+            np.savez(vectors_file, vectors=self._vectors[:count], ids=self._vector_ids[:count])
+        elif os.path.exists(vectors_file):
+            os.remove(vectors_file)
+
         # Save metadata
         meta_file = f"{self.index_path}/metadata.pkl"
         with open(meta_file, 'wb') as f:
@@ -296,10 +578,14 @@ class FAISSVectorStore:
         """Load index and metadata from disk."""
         index_file = f"{self.index_path}/faiss.index"
         meta_file = f"{self.index_path}/metadata.pkl"
+        vectors_file = f"{self.index_path}/vectors.npz"
 
         # Load FAISS index
         if os.path.exists(index_file):
             self.index = faiss.read_index(index_file)
+            if not isinstance(self.index, faiss.IndexIDMap2):
+                self.index = self._wrap_with_ids(self.index)
+            self._quantized = self._is_quantized(self.index)
             print(f"Loaded FAISS index from {index_file}")
 
         # Load metadata
@@ -310,11 +596,31 @@ class FAISSVectorStore:
                 self.next_id = data['next_id']
             print(f"Loaded metadata from {meta_file}")
 
+        # Restore the exact-search matrix
+        if self._vectors is not None and self.index.ntotal:
+            if self.index.ntotal > EXACT_SEARCH_MAX_VECTORS:
+                self._vectors = None
+            elif os.path.exists(vectors_file):
+                with np.load(vectors_file) as saved:
+                    self._append_vectors(saved['vectors'], saved['ids'])
+            elif self._quantized:
+                # Saved without its float32 vectors; don't re-rank against
+                # dequantized approximations
+                self._vectors = None
+            else:
+                ids = faiss.vector_to_array(self.index.id_map)
+                vectors = faiss.downcast_index(self.index.index).reconstruct_n(0, self.index.ntotal)
+                # Vectors the index could not delete have no metadata
+                live = np.isin(ids, np.fromiter(self.metadata, dtype=np.int64))
+                self._append_vectors(vectors[live], ids[live])
+
     def clear(self) -> None:
         """Clear all vectors and metadata."""
         self.index.reset()
         self.metadata.clear()
         self.next_id = 0
+        self._reset_vectors()
+        self._clear_search_cache()
 
 
 # Global vector store instances
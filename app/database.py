@@ -1,16 +1,55 @@
 """Database connection and session management."""
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
+from uuid import uuid4
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import settings
 
+
+def json_serializer(value: Any) -> str:
+    """Serialize JSON column values with orjson (numpy scalars included)."""
+    return orjson.dumps(
+        value,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+def json_deserializer(value: str) -> Any:
+    """Deserialize JSON column values with orjson."""
+    return orjson.loads(value)
+
+
+def engine_connect_args() -> Dict[str, Any]:
+    """
+    Build asyncpg connect arguments for the configured deployment.
+
+    Behind PgBouncer in transaction mode consecutive statements may run on
+    different server connections, so asyncpg's statement cache is disabled
+    and prepared statements get unique names instead of reused numeric ones.
+
+    Returns:
+        Keyword arguments passed to asyncpg.connect
+    """
+    if not settings.database_pgbouncer:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_recycle=settings.database_pool_recycle,
     pool_pre_ping=True,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
+    connect_args=engine_connect_args(),
 )
 
 # Create async session factory
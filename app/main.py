@@ -3,10 +3,12 @@ from contextlib import asynccontextmanager
 import logging
 from fastapi import FastAPI, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.config import settings
 from app.database import init_db, close_db
+from app.auth.jwt import calibrate_kdf
+from app.core.redis_client import close_redis
 from app.api import checks, usage, auth, users, organizations
 from app.utils.error_handling import (
     SimilarityPlatformException,
@@ -28,11 +30,15 @@ async def lifespan(app: FastAPI):
     print("Starting Similarity Intelligence Platform...")
     await init_db()
     print("Database initialized")
+    if settings.bcrypt_calibrate_on_startup:
+        rounds = calibrate_kdf()
+        print(f"Password hashing calibrated to bcrypt cost {rounds}")
 
     yield
 
     # Shutdown
     print("Shutting down...")
+    await close_redis()
     await close_db()
 
 
@@ -111,6 +117,7 @@ app = FastAPI(
     """,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -1,7 +1,7 @@
 """Check/job model."""
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Integer, Float, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -25,6 +25,10 @@ class Check(Base):
     word_count = Column(Integer, nullable=False)
     chunk_count = Column(Integer, default=0, nullable=False)
 
+    # Sanitized article text handed to the worker; cleared once processed.
+    # Deferred so status polling never loads it.
+    cleaned_text = deferred(Column(Text, nullable=True))
+
     # Check options
     check_articles = Column(Boolean, default=True, nullable=False)
     check_youtube = Column(Boolean, default=True, nullable=False)
@@ -55,7 +59,12 @@ class Check(Base):
 
     # Relationships
     organization = relationship("Organization", back_populates="checks")
-    matches = relationship("Match", back_populates="check", cascade="all, delete-orphan")
+    matches = relationship(
+        "Match",
+        back_populates="check",
+        cascade="all, delete-orphan",
+        order_by="Match.similarity_score.desc()"
+    )
 
     def __repr__(self):
         return f"<Check {self.id} ({self.status})>"
@@ -1,6 +1,6 @@
 """Match model for similarity results."""
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Text, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -14,7 +14,7 @@ class Match(Base):
     __tablename__ = "matches"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    check_id = Column(UUID(as_uuid=True), ForeignKey("checks.id", ondelete="CASCADE"), nullable=False, index=True)
+    check_id = Column(UUID(as_uuid=True), ForeignKey("checks.id", ondelete="CASCADE"), nullable=False)
     source_id = Column(UUID(as_uuid=True), ForeignKey("sources.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Match details
@@ -46,5 +46,10 @@ class Match(Base):
     check = relationship("Check", back_populates="matches")
     source = relationship("Source")
 
+    # Serves both check_id lookups and the score-ordered report read
+    __table_args__ = (
+        Index('idx_match_check_score', check_id, similarity_score.desc()),
+    )
+
     def __repr__(self):
         return f"<Match check={self.check_id} score={self.similarity_score:.2f}>"
@@ -1,6 +1,6 @@
 """Organization model."""
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, BigInteger, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -28,6 +28,10 @@ class Organization(Base):
     monthly_check_limit = Column(Integer, default=100, nullable=False)
     current_month_checks = Column(Integer, default=0, nullable=False)
 
+    # Lifetime usage, maintained by the check task as checks complete
+    lifetime_checks = Column(BigInteger, default=0, nullable=False)
+    lifetime_cost_usd = Column(Float, default=0.0, nullable=False)
+
     # Status
     is_active = Column(Boolean, default=True, nullable=False)
 
@@ -1,6 +1,6 @@
 """User model for authentication and management."""
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -17,8 +17,7 @@ class User(Base):
     organization_id = Column(
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Auth credentials
@@ -37,12 +36,26 @@ class User(Base):
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Stamped by the database on UPDATE (naive UTC, like the other columns)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=func.timezone("utc", func.now()),
+        nullable=False
+    )
     last_login_at = Column(DateTime, nullable=True)
 
     # Relationships
     organization = relationship("Organization", foreign_keys=[organization_id])
 
+    # Serves organization_id lookups and the newest-first user listing
+    __table_args__ = (
+        Index('idx_user_org_created', organization_id, created_at.desc(), id.desc()),
+    )
+
+    # Read the database-stamped updated_at back via RETURNING on flush
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<User {self.username} ({self.role})>"
 
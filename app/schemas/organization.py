@@ -105,3 +105,5 @@ class APIKeyListResponse(BaseModel):
     """List of API keys."""
     api_keys: List[APIKeyResponse]
     total: int
+    page: int
+    page_size: int
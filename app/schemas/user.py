@@ -56,6 +56,8 @@ class UserResponse(BaseModel):
 class UserListResponse(BaseModel):
     """List of users."""
     users: List[UserResponse]
-    total: int
+    total: Optional[int] = None  # Not computed for cursor (after/after_id) requests
     page: int
     page_size: int
+    next_after: Optional[datetime] = None
+    next_after_id: Optional[UUID] = None
@@ -7,7 +7,7 @@ celery_app = Celery(
     "similarity_platform",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["app.tasks.similarity_check"]
+    include=["app.tasks.similarity_check", "app.tasks.quota"]
 )
 
 # Configure Celery
@@ -22,4 +22,18 @@ celery_app.conf.update(
     task_soft_time_limit=540,  # 9 minutes soft limit
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=100,
+    beat_schedule={
+        "reconcile-quota-counters": {
+            "task": "reconcile_quota_counters",
+            "schedule": float(settings.quota_reconcile_interval_seconds),
+        },
+        "flush-api-key-usage": {
+            "task": "flush_api_key_usage",
+            "schedule": float(settings.api_key_usage_flush_interval_seconds),
+        },
+        "reconcile-usage-totals": {
+            "task": "reconcile_usage_totals",
+            "schedule": 24 * 60 * 60.0,  # nightly
+        },
+    },
 )
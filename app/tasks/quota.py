@@ -0,0 +1,165 @@
+"""Quota and usage counter reconciliation Celery tasks."""
+import asyncio
+import logging
+import redis.asyncio as redis
+from sqlalchemy import Integer, DateTime, select, update, values, column, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from app.tasks.celery_app import celery_app
+from app.config import settings
+from app.database import engine_connect_args
+from app.models.organization import Organization
+from app.models.check import Check
+from app.models.api_key import APIKey
+from app.core.quota import read_counters
+from app.core.rate_limit import drain_usage
+
+logger = logging.getLogger(__name__)
+
+# Beat runs this rarely; don't hold idle connections between runs
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    poolclass=NullPool,
+    connect_args=engine_connect_args()
+)
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@celery_app.task(name="reconcile_quota_counters", ignore_result=True)
+def reconcile_quota_counters():
+    """Fold Redis monthly quota counters into organizations.current_month_checks."""
+    # Reuse the worker's loop (as process_similarity_check does) rather than
+    # asyncio.run, which would close it under the other task's connections
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(_reconcile_async())
+
+
+async def _reconcile_async() -> int:
+    """
+    Copy this period's Redis counters to the database in one UPDATE.
+
+    Counts only move forward, so database increments made while Redis was
+    unavailable are never overwritten with a lower value.
+
+    Returns:
+        Number of counters reconciled
+    """
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        counters = await read_counters(client)
+    finally:
+        await client.aclose()
+
+    if not counters:
+        return 0
+
+    counter_rows = values(
+        column("organization_id", UUID(as_uuid=True)),
+        column("checks", Integer),
+        name="quota_counters"
+    ).data(list(counters.items()))
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Organization)
+            .where(Organization.id == counter_rows.c.organization_id)
+            .where(Organization.current_month_checks < counter_rows.c.checks)
+            .values(current_month_checks=counter_rows.c.checks)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    logger.info("Reconciled %d quota counters", len(counters))
+    return len(counters)
+
+
+@celery_app.task(name="reconcile_usage_totals", ignore_result=True)
+def reconcile_usage_totals():
+    """Recompute organizations' lifetime usage columns from their checks."""
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(_reconcile_usage_async())
+
+
+async def _reconcile_usage_async() -> None:
+    """
+    Correct drift in lifetime_checks / lifetime_cost_usd.
+
+    The columns are incremented as checks complete; this recomputes them
+    from completed checks in one UPDATE ... FROM aggregate.
+    """
+    totals = (
+        select(
+            Check.organization_id,
+            func.count(Check.id).label("checks"),
+            func.coalesce(func.sum(Check.estimated_cost_usd), 0.0).label("cost")
+        )
+        .where(Check.status == "completed")
+        .group_by(Check.organization_id)
+        .subquery("usage_totals")
+    )
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Organization)
+            .where(Organization.id == totals.c.organization_id)
+            .values(lifetime_checks=totals.c.checks, lifetime_cost_usd=totals.c.cost)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    logger.info("Reconciled lifetime usage totals")
+
+
+@celery_app.task(name="flush_api_key_usage", ignore_result=True)
+def flush_api_key_usage():
+    """Write API key usage buffered in Redis back to the api_keys table."""
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(_flush_api_key_usage_async())
+
+
+async def _flush_api_key_usage_async() -> int:
+    """
+    Add buffered request counts to api_keys in one UPDATE.
+
+    Returns:
+        Number of API keys updated
+    """
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        usage = await drain_usage(client)
+    finally:
+        await client.aclose()
+
+    if not usage:
+        return 0
+
+    usage_rows = values(
+        column("api_key_id", UUID(as_uuid=True)),
+        column("requests", Integer),
+        column("last_used", DateTime),
+        name="api_key_usage"
+    ).data([
+        (api_key_id, requests, last_used)
+        for api_key_id, (requests, last_used) in usage.items()
+    ])
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(APIKey)
+            .where(APIKey.id == usage_rows.c.api_key_id)
+            .values(
+                total_requests=APIKey.total_requests + usage_rows.c.requests,
+                last_used_at=func.greatest(
+                    func.coalesce(APIKey.last_used_at, usage_rows.c.last_used),
+                    usage_rows.c.last_used
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    logger.info("Flushed usage for %d API keys", len(usage))
+    return len(usage)
@@ -2,14 +2,16 @@
 import time
 from datetime import datetime
 from uuid import UUID
-from typing import List
-from sqlalchemy import select
-from sqlalchemy.orm import sessionmaker
+from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker, undefer
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 
 from app.tasks.celery_app import celery_app
 from app.config import settings
+from app.database import json_serializer, json_deserializer, engine_connect_args
 from app.models.check import Check
+from app.models.organization import Organization
 from app.models.source import Source
 from app.models.match import Match
 from app.core.chunking import TextChunker
@@ -20,39 +22,54 @@ from app.core.youtube import search_and_fetch_transcripts
 
 
 # Create async engine for Celery tasks
-engine = create_async_engine(settings.database_url, echo=False)
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
+    connect_args=engine_connect_args()
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 @celery_app.task(bind=True, name="process_similarity_check")
-def process_similarity_check(self, check_id: str, article_text: str):
+def process_similarity_check(self, check_id: str, article_text: Optional[str] = None):
     """
     Process similarity check asynchronously.
 
     Args:
         check_id: Check ID
-        article_text: Article text to analyze
+        article_text: Article text to analyze (read from the check row when
+            omitted, as the API now does to keep broker messages small)
     """
     import asyncio
     loop = asyncio.get_event_loop()
     return loop.run_until_complete(_process_check_async(check_id, article_text))
 
 
-async def _process_check_async(check_id: str, article_text: str):
+async def _process_check_async(check_id: str, article_text: Optional[str] = None):
     """Async implementation of similarity check."""
     start_time = time.time()
+    check = None
 
     async with AsyncSessionLocal() as db:
         try:
-            # Get check
+            # Get check, with the article text the API stored on it
             result = await db.execute(
-                select(Check).where(Check.id == UUID(check_id))
+                select(Check)
+                .options(undefer(Check.cleaned_text))
+                .where(Check.id == UUID(check_id))
             )
             check = result.scalar_one_or_none()
 
             if not check:
                 raise ValueError(f"Check {check_id} not found")
 
+            if article_text is None:
+                article_text = check.cleaned_text
+            if not article_text:
+                raise ValueError(f"Check {check_id} has no article text")
+
             # Update status
             check.status = "processing"
             check.started_at = datetime.utcnow()
@@ -108,7 +125,11 @@ async def _process_check_async(check_id: str, article_text: str):
 
             # Save matches to database
             for agg_match in aggregated_matches[:20]:  # Limit to top 20 sources
-                # Prepare matched chunks data
+                # Store the five strongest chunk matches, best first, so the
+                # report reads them back as-is
+                top_chunks = sorted(
+                    agg_match.matches, key=lambda m: m.similarity_score, reverse=True
+                )[:5]
                 matched_chunks_data = [
                     {
                         "submission_text": m.submission_chunk.text,
@@ -116,7 +137,7 @@ async def _process_check_async(check_id: str, article_text: str):
                         "similarity_score": round(m.similarity_score, 3),
                         "timestamp": m.source_metadata.get("timestamp") if m.source_metadata else None
                     }
-                    for m in agg_match.matches[:5]
+                    for m in top_chunks
                 ]
 
                 match = Match(
@@ -145,6 +166,19 @@ async def _process_check_async(check_id: str, article_text: str):
             check.completed_at = datetime.utcnow()
             check.processing_time_seconds = time.time() - start_time
             check.estimated_cost_usd = settings.target_cost_per_check_usd
+            check.cleaned_text = None  # Only needed while processing
+
+            # Roll the check into the organization's lifetime usage in the
+            # same transaction that marks it completed
+            await db.execute(
+                update(Organization)
+                .where(Organization.id == check.organization_id)
+                .values(
+                    lifetime_checks=Organization.lifetime_checks + 1,
+                    lifetime_cost_usd=Organization.lifetime_cost_usd + check.estimated_cost_usd
+                )
+                .execution_options(synchronize_session=False)
+            )
 
             await db.commit()
 
@@ -160,6 +194,7 @@ async def _process_check_async(check_id: str, article_text: str):
             if check:
                 check.status = "failed"
                 check.error_message = str(e)
+                check.cleaned_text = None
                 check.completed_at = datetime.utcnow()
                 await db.commit()
 
@@ -185,15 +220,14 @@ async def _check_articles(
     if article_store.count() > 0:
         print(f"Searching local article corpus ({article_store.count()} vectors)...")
 
-        # Search for each chunk
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            # Search vector store
-            results = article_store.search(
-                embedding,
-                k=10,
-                filter_fn=lambda meta: meta.source_type == "article"
-            )
+        # Search for all chunks in one batch
+        all_results = article_store.batch_search(
+            embeddings,
+            k=10,
+            filter_fn=lambda meta: meta.source_type == "article"
+        )
 
+        for chunk, results in zip(chunks, all_results):
             # Convert to SimilarityMatch
             for meta, score in results:
                 if score >= threshold:
@@ -271,12 +305,17 @@ async def _check_web_articles(
             timeout=settings.web_article_fetch_timeout
         )
 
-        # Fetch and compare articles
-        for idx, result in enumerate(search_results[:settings.max_web_articles]):
-            print(f"[{idx+1}/{len(search_results)}] Fetching: {result.title[:50]}...")
+        # Fetch all candidate articles concurrently, then compare each
+        search_results = search_results[:settings.max_web_articles]
+        fetched = await fetcher.afetch_multiple([result.url for result in search_results])
 
-            # Fetch article content
-            article_content = fetcher.fetch_article(result.url)
+        # Chunk every fetched article first so all web chunks are embedded
+        # in one batched call instead of one model call per article
+        articles = []
+        for idx, result in enumerate(search_results):
+            print(f"[{idx+1}/{len(search_results)}] Chunking: {result.title[:50]}...")
+
+            article_content = fetched.get(result.url)
 
             if not article_content or len(article_content) < 100:
                 print(f"   Skipped (failed to fetch or too short)")
@@ -290,10 +329,21 @@ async def _check_web_articles(
                 continue
 
             print(f"   Fetched {len(article_content)} chars, {len(web_chunks)} chunks")
+            articles.append((result, web_chunks))
+
+        if not articles:
+            return matches
+
+        # Generate embeddings for all web article chunks
+        all_web_embeddings = engine.embedder.encode_chunks(
+            [chunk for _, web_chunks in articles for chunk in web_chunks]
+        )
 
-            # Generate embeddings for web article chunks
+        offset = 0
+        for result, web_chunks in articles:
             web_chunk_texts = [chunk.text for chunk in web_chunks]
-            web_embeddings = engine.embedder.encode(web_chunk_texts, normalize=True)
+            web_embeddings = all_web_embeddings[offset:offset + len(web_chunks)]
+            offset += len(web_chunks)
 
             # Compare submission chunks against web article chunks
             article_match_count = 0
@@ -324,7 +374,7 @@ async def _check_web_articles(
                         )
                         article_match_count += 1
 
-            print(f"   Found {article_match_count} matches")
+            print(f"   {result.title[:50]}: found {article_match_count} matches")
 
         print(f"Web article search complete: {len(matches)} total matches")
 
@@ -186,6 +186,7 @@ def log_error(
 
 def log_warning(
     message: str,
+    *args: Any,
     context: Optional[str] = None,
     extra: Optional[Dict] = None
 ):
@@ -193,20 +194,25 @@ def log_warning(
     Log warning with structured data.
 
     Args:
-        message: Warning message
+        message: Warning message (%-style format string)
+        *args: Arguments merged into the message only if it is emitted
         context: Context description
         extra: Additional data
     """
+    if not logger.isEnabledFor(logging.WARNING):
+        return
+
     log_data = {
         "context": context,
         **(extra or {})
     }
 
-    logger.warning(message, extra=log_data)
+    logger.warning(message, *args, extra=log_data)
 
 
 def log_info(
     message: str,
+    *args: Any,
     context: Optional[str] = None,
     extra: Optional[Dict] = None
 ):
@@ -214,16 +220,20 @@ def log_info(
     Log info with structured data.
 
     Args:
-        message: Info message
+        message: Info message (%-style format string)
+        *args: Arguments merged into the message only if it is emitted
         context: Context description
         extra: Additional data
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     log_data = {
         "context": context,
         **(extra or {})
     }
 
-    logger.info(message, extra=log_data)
+    logger.info(message, *args, extra=log_data)
 
 
 # Safe Execution Wrapper
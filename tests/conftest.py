@@ -173,6 +173,10 @@ def mock_embedding_generator():
             embeddings = embeddings / norms
         return embeddings
 
+    # Mock encode_chunks method
+    def mock_encode_chunks(chunks, batch_size=64):
+        return mock_encode([chunk.text for chunk in chunks])
+
     # Mock batch_similarity method
     def mock_batch_similarity(embedding, embeddings_list):
         # Return fixed similarities for testing
@@ -180,6 +184,7 @@ def mock_embedding_generator():
         return np.random.uniform(0.5, 0.95, len(embeddings_list))
 
     mock_gen.encode = Mock(side_effect=mock_encode)
+    mock_gen.encode_chunks = Mock(side_effect=mock_encode_chunks)
     mock_gen.batch_similarity = Mock(side_effect=mock_batch_similarity)
     mock_gen.dimension = 384
 
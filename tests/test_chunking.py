@@ -102,6 +102,19 @@ class TestTextChunker:
         overlap_count = len(original_words & chunk_words)
         assert overlap_count >= len(original_words) * 0.8  # At least 80% preserved
 
+    def test_chunk_offsets_match_normalized_text(self, chunker):
+        """Test that chunk character offsets locate the chunk in the normalized text."""
+        text = " ".join(f"Word{i}, and  more\ttext." for i in range(80))
+        normalized = chunker.normalize_text(text)
+        chunks = chunker.chunk_text(text, normalize=True)
+        unnormalized = chunker.chunk_text(normalized, normalize=False)
+
+        assert len(chunks) > 1
+        for chunk, expected in zip(chunks, unnormalized):
+            assert normalized[chunk.start_index:chunk.end_index] == chunk.text
+            assert chunk == expected
+            assert chunk.word_count == len(chunk.text.split())
+
 
 class TestExtractKeywords:
     """Test cases for keyword extraction."""
@@ -1,9 +1,12 @@
 """Tests for embedding generation module."""
+import threading
+import time
 import pytest
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 
-from app.core.embeddings import EmbeddingGenerator, get_embedding_generator
+from app.core.chunking import TextChunk
+from app.core.embeddings import EmbeddingGenerator, get_embedding_generator, quantize_int8
 
 
 class TestEmbeddingGenerator:
@@ -121,6 +124,34 @@ class TestEmbeddingGenerator:
         assert embedding.shape == (384,)
         assert isinstance(embedding, np.ndarray)
 
+    def test_encode_chunks_preserves_order(self, generator, mock_model):
+        """Test that encode_chunks returns rows in the order of the chunks."""
+        texts = ["a much longer chunk of text", "short", "medium text"]
+        chunks = [
+            TextChunk(text=text, start_index=0, end_index=len(text),
+                      chunk_index=i, word_count=len(text.split()))
+            for i, text in enumerate(texts)
+        ]
+
+        # Embed each text as a one-hot row keyed by its length
+        def length_encode(texts, **kwargs):
+            embeddings = np.zeros((len(texts), 384), dtype=np.float32)
+            for i, text in enumerate(texts):
+                embeddings[i, len(text)] = 1.0
+            return embeddings
+
+        mock_model.encode.side_effect = length_encode
+
+        embeddings = generator.encode_chunks(chunks)
+
+        # Model sees texts shortest first in a single call
+        mock_model.encode.assert_called_once()
+        assert mock_model.encode.call_args[0][0] == ["short", "medium text", "a much longer chunk of text"]
+
+        assert embeddings.shape == (3, 384)
+        for i, text in enumerate(texts):
+            assert embeddings[i, len(text)] == 1.0
+
     def test_similarity_identical_embeddings(self, generator):
         """Test similarity between identical embeddings."""
         # Create identical normalized embeddings
@@ -221,6 +252,35 @@ class TestEmbeddingGenerator:
         # Should return empty array
         assert similarities.shape == (0,)
 
+    def test_batch_similarity_int8(self, generator):
+        """Test batch similarity against int8-quantized candidates."""
+        np.random.seed(42)
+
+        query = np.random.randn(384)
+        query = query / np.linalg.norm(query)
+
+        candidates = np.random.randn(5, 384)
+        candidates = candidates / np.linalg.norm(candidates, axis=1, keepdims=True)
+        candidates[0] = query
+
+        quantized, scales = quantize_int8(candidates)
+        assert quantized.dtype == np.int8
+        assert scales.shape == (5,)
+
+        similarities = generator.batch_similarity(query, quantized, scales)
+
+        # Should match float similarities within quantization error
+        expected = generator.batch_similarity(query, candidates)
+        assert np.allclose(similarities, expected, atol=1e-2)
+        assert np.isclose(similarities[0], 1.0, atol=1e-2)
+
+    def test_batch_similarity_int8_requires_scales(self, generator):
+        """Test that int8 candidates without scales are rejected."""
+        quantized, _ = quantize_int8(np.random.randn(3, 384))
+
+        with pytest.raises(ValueError):
+            generator.batch_similarity(np.random.randn(384), quantized)
+
     def test_encode_batch_size_parameter(self, generator):
         """Test that batch_size parameter is passed correctly."""
         texts = [f"Text {i}" for i in range(10)]
@@ -230,6 +290,34 @@ class TestEmbeddingGenerator:
 
         assert embeddings.shape == (10, 384)
 
+    def test_concurrent_init_loads_model_once(self):
+        """Test that concurrent first instantiations load the model once."""
+        def slow_load(model_name):
+            time.sleep(0.05)
+            return MagicMock()
+
+        with patch('app.core.embeddings.SentenceTransformer') as mock_st:
+            mock_st.side_effect = slow_load
+
+            EmbeddingGenerator._instance = None
+            EmbeddingGenerator._model = None
+
+            with patch('app.core.embeddings.settings') as mock_settings:
+                mock_settings.embedding_model = "test-model"
+
+                instances = []
+                threads = [
+                    threading.Thread(target=lambda: instances.append(EmbeddingGenerator()))
+                    for _ in range(8)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        assert mock_st.call_count == 1
+        assert all(instance is instances[0] for instance in instances)
+
     def test_model_loading_error(self):
         """Test handling of model loading errors."""
         with patch('app.core.embeddings.SentenceTransformer') as mock_st:
@@ -0,0 +1,210 @@
+"""Tests for the FAISS vector store."""
+import pickle
+
+import faiss
+import numpy as np
+import pytest
+
+from app.core.vector_store import EXACT_SEARCH_MAX_VECTORS, FAISSVectorStore, VectorMetadata
+
+DIMENSION = 16
+
+
+def make_vectors(count, seed=0):
+    """Random unit vectors."""
+    vectors = np.random.default_rng(seed).standard_normal((count, DIMENSION)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def make_metadata(count, source_id="source"):
+    """Metadata for count chunks of one source."""
+    return [VectorMetadata(source_id, "article", i, f"chunk {i}") for i in range(count)]
+
+
+def make_store(path, **kwargs):
+    """Create a store with an explicit index configuration."""
+    kwargs.setdefault("int8", False)
+    kwargs.setdefault("index_type", "flat")
+    return FAISSVectorStore(DIMENSION, index_path=str(path), **kwargs)
+
+
+def result_keys(results):
+    """(source_id, chunk_index) of each search result."""
+    return [(meta.source_id, meta.chunk_index) for meta, _ in results]
+
+
+class TestFAISSVectorStore:
+    """Test cases for FAISSVectorStore."""
+
+    @pytest.fixture
+    def vectors(self):
+        """Vectors for a small store."""
+        return make_vectors(200)
+
+    @pytest.mark.parametrize("config", [
+        {},
+        {"int8": True},
+        {"index_type": "hnsw"},
+    ])
+    def test_search_and_batch_search_agree(self, tmp_path, vectors, config):
+        """Test that single and batched searches return the same results."""
+        store = make_store(tmp_path, **config)
+        store.add_vectors(vectors, make_metadata(len(vectors)))
+
+        batched = store.batch_search(vectors[:5].copy(), k=5)
+
+        for query, batch_results in zip(vectors[:5], batched):
+            results = store.search(query.copy(), k=5)
+            assert len(results) == 5
+            assert result_keys(results) == result_keys(batch_results)
+            assert [s for _, s in results] == pytest.approx([s for _, s in batch_results], abs=1e-5)
+
+    def test_search_finds_exact_match(self, tmp_path, vectors):
+        """Test that a stored vector is its own nearest neighbour."""
+        store = make_store(tmp_path)
+        store.add_vectors(vectors, make_metadata(len(vectors)))
+
+        results = store.search(vectors[7].copy(), k=3)
+
+        assert results[0][0].chunk_index == 7
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_search_empty_store(self, tmp_path, vectors):
+        """Test searching a store with no vectors."""
+        store = make_store(tmp_path)
+
+        assert store.search(vectors[0].copy(), k=5) == []
+        assert store.batch_search(vectors[:2].copy(), k=5) == [[], []]
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    def test_remove_by_source(self, tmp_path, vectors, index_type):
+        """Test that removed vectors are no longer returned."""
+        store = make_store(tmp_path, index_type=index_type)
+        store.add_vectors(vectors[:100], make_metadata(100, "removed"))
+        store.add_vectors(vectors[100:], make_metadata(100, "kept"))
+
+        assert store.remove_by_source("removed") == 100
+        assert store.count() == 100
+        if index_type == "flat":
+            assert store.index.ntotal == 100
+
+        results = store.search(vectors[5].copy(), k=10)
+        assert len(results) == 10
+        assert all(meta.source_id == "kept" for meta, _ in results)
+
+        batched = store.batch_search(vectors[:3].copy(), k=10)
+        assert all(len(results) == 10 for results in batched)
+        assert all(meta.source_id == "kept" for results in batched for meta, _ in results)
+
+    def test_remove_all_sources_clears_store(self, tmp_path, vectors):
+        """Test that removing every vector empties the index."""
+        store = make_store(tmp_path)
+        store.add_vectors(vectors, make_metadata(len(vectors)))
+
+        store.remove_by_source("source")
+
+        assert store.count() == 0
+        assert store.index.ntotal == 0
+
+    def test_load_legacy_index(self, tmp_path, vectors):
+        """Test loading an index saved before vectors carried IDs."""
+        # Positions are vector IDs; odd IDs were removed from metadata only
+        index = faiss.IndexFlatIP(DIMENSION)
+        index.add(vectors[:20])
+        faiss.write_index(index, str(tmp_path / "faiss.index"))
+        with open(tmp_path / "metadata.pkl", "wb") as f:
+            pickle.dump({
+                "metadata": {i: VectorMetadata("source", "article", i, "t") for i in range(0, 20, 2)},
+                "next_id": 20
+            }, f)
+
+        store = make_store(tmp_path)
+
+        assert isinstance(store.index, faiss.IndexIDMap2)
+        results = store.search(vectors[1].copy(), k=5)
+        assert len(results) == 5
+        assert all(meta.chunk_index % 2 == 0 for meta, _ in results)
+        assert len(store.batch_search(vectors[1:3].copy(), k=5)[0]) == 5
+
+        new_ids = store.add_vectors(vectors[20:21], make_metadata(1, "new"))
+        assert new_ids == [20]
+        assert store.search(vectors[20].copy(), k=1)[0][0].source_id == "new"
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    def test_int8_save_load_scores(self, tmp_path, vectors, index_type):
+        """Test that an 8-bit store scores the same after a reload."""
+        store = make_store(tmp_path, int8=True, index_type=index_type)
+        store.add_vectors(vectors, make_metadata(len(vectors)))
+        before = store.search(vectors[3].copy(), k=5)
+        store.save()
+
+        reloaded = make_store(tmp_path, int8=True, index_type=index_type)
+        after = reloaded.search(vectors[3].copy(), k=5)
+
+        assert result_keys(after) == result_keys(before)
+        assert [s for _, s in after] == [s for _, s in before]
+        assert after[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_int8_scores_bounded_without_float32_copy(self, tmp_path):
+        """Test that a large 8-bit store never scores above 1."""
+        vectors = make_vectors(EXACT_SEARCH_MAX_VECTORS + 10)
+        store = make_store(tmp_path, int8=True)
+        store.add_vectors(vectors, make_metadata(len(vectors)))
+        assert store._vectors is None
+
+        queries = vectors[:20].copy()
+        for query in queries:
+            results = store.search(query.copy(), k=5)
+            assert all(-1.0 <= score <= 1.0 for _, score in results)
+
+        batched = store.batch_search(queries, k=5)
+        assert all(-1.0 <= score <= 1.0 for results in batched for _, score in results)
+
+    def test_save_load_after_remove(self, tmp_path, vectors):
+        """Test that removals persist across a reload."""
+        store = make_store(tmp_path)
+        store.add_vectors(vectors[:100], make_metadata(100, "removed"))
+        store.add_vectors(vectors[100:], make_metadata(100, "kept"))
+        store.remove_by_source("removed")
+        store.save()
+
+        reloaded = make_store(tmp_path)
+
+        assert reloaded.count() == 100
+        results = reloaded.search(vectors[5].copy(), k=10)
+        assert len(results) == 10
+        assert all(meta.source_id == "kept" for meta, _ in results)
+
+    def test_search_cache_invalidated_on_add(self, tmp_path, vectors):
+        """Test that adding vectors drops cached results."""
+        store = make_store(tmp_path)
+        store.add_vectors(vectors[:100], make_metadata(100, "old"))
+        query = vectors[150].copy()
+        store.search(query.copy(), k=1)
+
+        store.add_vectors(vectors[150:151], make_metadata(1, "new"))
+
+        assert store.search(query.copy(), k=1)[0][0].source_id == "new"
+
+    def test_search_cache_invalidated_on_remove(self, tmp_path, vectors):
+        """Test that removing vectors drops cached results."""
+        store = make_store(tmp_path)
+        store.add_vectors(vectors[:100], make_metadata(100, "kept"))
+        store.add_vectors(vectors[100:], make_metadata(100, "removed"))
+        query = vectors[150].copy()
+        assert store.search(query.copy(), k=1)[0][0].source_id == "removed"
+
+        store.remove_by_source("removed")
+
+        assert store.search(query.copy(), k=1)[0][0].source_id == "kept"
+
+    def test_search_cache_returns_copies(self, tmp_path, vectors):
+        """Test that callers can't modify cached results."""
+        store = make_store(tmp_path)
+        store.add_vectors(vectors, make_metadata(len(vectors)))
+
+        first = store.search(vectors[0].copy(), k=3)
+        first.clear()
+
+        assert len(store.search(vectors[0].copy(), k=3)) == 3